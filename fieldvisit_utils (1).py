@@ -1,12 +1,23 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, List, Optional, Iterable, Tuple
+import csv
+import multiprocessing as mp
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime, timezone, tzinfo
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Iterable, Tuple
 
 import numpy as np
 import pandas as pd
-import pytz
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    # Python < 3.9
+    from backports.zoneinfo import ZoneInfo
 try:
 
     from astral import sun
@@ -15,119 +26,399 @@ try:
 except Exception:
     _HAS_ASTRAL = False
 
-from math import acos, asin, atan, ceil, cos, degrees, fmod, radians, sin, sqrt
-def _julian_date(dt: datetime) -> float:
-    ts = dt.timestamp()
-    return ts / 86400.0 + 2440587.5
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    _HAS_PYARROW = True
+except Exception:
+    _HAS_PYARROW = False
+
+from math import radians, sin
 
-def _ts_from_julian(j: float) -> float:
+# Constants used by the solar approximation
+_SIN_OBLIQ = sin(radians(23.4397))
+_J2000 = 2451545.0 + 0.0009
+_UTC = timezone.utc
+_NAT_NS = np.iinfo(np.int64).min
 
-    return (j - 2440587.5) * 86400.0
+def _ns_from_julian(j: np.ndarray) -> np.ndarray:
+    # Julian dates to int64 nanoseconds since the epoch; NaN becomes the NaT sentinel
+    missing = np.isnan(j)
+    ns = np.where(missing, 0.0, (j - 2440587.5) * 86400e9).astype(np.int64)
+    ns[missing] = _NAT_NS
+    return ns
 
 def _fallback_sunrise_sunset(
     date_obj: date,
     latitude: float,
     longitude: float,
-    tz: pytz.BaseTzInfo,
+    tz: tzinfo,
     elevation: float = 0.0,
 ) -> Tuple[Optional[datetime], Optional[datetime]]:
 
-    midday = datetime(date_obj.year, date_obj.month, date_obj.day, 12, 0, 0, tzinfo=pytz.UTC)
-    J_date = _julian_date(midday)
+    # One-element call into the array version so both share the same NOAA approximation
+    if not (np.isfinite(latitude) and np.isfinite(longitude) and np.isfinite(elevation)):
+        raise ValueError("latitude, longitude and elevation must be finite")
+    sunrise, sunset = noaa_sunrise_sunset(
+        [date_obj], [float(latitude)], [float(longitude)], [float(elevation)]
+    )
+    def to_dt(ts: pd.Timestamp) -> Optional[datetime]:
+        return None if pd.isna(ts) else datetime.fromtimestamp(ts.value / 1e9, tz)
+
+    return to_dt(sunrise[0]), to_dt(sunset[0])
+
+def noaa_sunrise_sunset(
+    dates: Any,
+    lats: Any,
+    lons: Any,
+    elevations: Any = 0.0,
+) -> Tuple[pd.DatetimeIndex, pd.DatetimeIndex]:
+    ##NOAA sunrise and sunset (UTC) for parallel arrays; NaT where an input is missing or the sun does not rise/set
+    days = np.asarray(pd.to_datetime(dates, errors="coerce"), dtype="datetime64[D]")
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    elevations = np.asarray(elevations, dtype=np.float64)
+
+    # Julian date at midday UTC
+    J_date = days.astype("datetime64[s]").astype(np.float64) / 86400.0 + 2440587.5 + 0.5
+    J_date[np.isnat(days)] = np.nan
 
-    l_w = -longitude
-    n = ceil(J_date - (2451545.0 + 0.0009) + 69.184 / 86400.0)
-    J_star = n + 0.0009 - l_w / 360.0
-    M_deg = fmod(357.5291 + 0.98560028 * J_star, 360.0)
-    M_rad = radians(M_deg)
+    l_w = -lons
+    n = np.ceil(J_date - _J2000 + 69.184 / 86400.0)
+    J_star = n + 0.0009 + l_w / 360.0
+    M_deg = np.fmod(357.5291 + 0.98560028 * J_star, 360.0)
+    M_rad = np.radians(M_deg)
     # Equation of the center (degrees)
-    C_deg = 1.9148 * sin(M_rad) + 0.02 * sin(2.0 * M_rad) + 0.0003 * sin(3.0 * M_rad)
+    C_deg = 1.9148 * np.sin(M_rad) + 0.02 * np.sin(2.0 * M_rad) + 0.0003 * np.sin(3.0 * M_rad)
     # Ecliptic longitude (degrees)
-    lambda_deg = fmod(M_deg + C_deg + 180.0 + 102.9372, 360.0)
-    lambda_rad = radians(lambda_deg)
+    lambda_deg = np.fmod(M_deg + C_deg + 180.0 + 102.9372, 360.0)
+    lambda_rad = np.radians(lambda_deg)
     # Solar transit (Julian date)
-    J_transit = 2451545.0 + J_star + 0.0053 * sin(M_rad) - 0.0069 * sin(2.0 * lambda_rad)
+    J_transit = 2451545.0 + J_star + 0.0053 * np.sin(M_rad) - 0.0069 * np.sin(2.0 * lambda_rad)
     # Sun declination
-    sin_delta = sin(lambda_rad) * sin(radians(23.4397))
-    cos_delta = cos(asin(sin_delta))
+    sin_delta = np.sin(lambda_rad) * _SIN_OBLIQ
+    cos_delta = np.cos(np.arcsin(sin_delta))
     # Hour angle calculation
-    dip = -0.833 - 2.076 * sqrt(max(elevation, 0.0)) / 60.0
-    # Compute cosine of hour angle
+    dip = -0.833 - 2.076 * np.sqrt(np.maximum(elevations, 0.0)) / 60.0
+    lat_rad = np.radians(lats)
     some_cos = (
-        sin(radians(dip)) - sin(radians(latitude)) * sin_delta
-    ) / (cos(radians(latitude)) * cos_delta)
-    # If |some_cos| > 1 then the sun never rises/sets
-    if some_cos <= -1.0:
-        sunrise_j = J_transit - 0.5
-        sunset_j = None
-    elif some_cos >= 1.0:
-        sunrise_j = None
-        sunset_j = None
-    else:
-        w0_rad = acos(some_cos)
-        w0_deg = degrees(w0_rad)
-        sunrise_j = J_transit - w0_deg / 360.0
-        sunset_j = J_transit + w0_deg / 360.0
-    # Convert Julian dates to UTC datetimes and then to the requested timezone
-    def julian_to_dt(j: Optional[float]) -> Optional[datetime]:
-        if j is None:
-            return None
-        ts = _ts_from_julian(j)
-        dt_utc = datetime.utcfromtimestamp(ts).replace(tzinfo=pytz.UTC)
-        return dt_utc.astimezone(tz)
+        np.sin(np.radians(dip)) - np.sin(lat_rad) * sin_delta
+    ) / (np.cos(lat_rad) * cos_delta)
+    # Branch-free hour angle; the polar cases are masked afterwards
+    polar_night = some_cos >= 1.0
+    polar_day = some_cos <= -1.0
+    w0_deg = np.degrees(np.arccos(np.clip(some_cos, -1.0, 1.0)))
+    sunrise_j = np.where(polar_night | polar_day, np.nan, J_transit - w0_deg / 360.0)
+    sunset_j = np.where(polar_night | polar_day, np.nan, J_transit + w0_deg / 360.0)
+    # Polar day keeps a sunrise half a day before transit
+    sunrise_j = np.where(polar_day, J_transit - 0.5, sunrise_j)
 
-    sunrise_dt = julian_to_dt(sunrise_j)
-    sunset_dt = julian_to_dt(sunset_j)
-    return sunrise_dt, sunset_dt
+    sunrise = pd.to_datetime(_ns_from_julian(sunrise_j), unit="ns", utc=True)
+    sunset = pd.to_datetime(_ns_from_julian(sunset_j), unit="ns", utc=True)
+    return sunrise, sunset
 
-TIMEZONE = pytz.timezone("Europe/Amsterdam")
+TIMEZONE = ZoneInfo("Europe/Amsterdam")
 
+# Passing ``dt_format`` (e.g. "ISO8601" or "%Y-%m-%d %H:%M:%S") lets pandas skip
+# format inference for string input, which is >10x faster on large columns.
 def parse_local(
     dt: Any,
-    tz: pytz.BaseTzInfo = TIMEZONE,
+    tz: tzinfo = TIMEZONE,
+    dt_format: Optional[str] = None,
 ) -> Optional[datetime]:
-    if isinstance(dt, pd.Timestamp):
-        if dt.tzinfo is None:
-            return tz.localize(dt.to_pydatetime())
-        return dt.tz_convert(tz)
-    elif isinstance(dt, datetime):
-        if dt.tzinfo is None:
-            return tz.localize(dt)
-        return dt.astimezone(tz)
-    elif isinstance(dt, str) and dt:
-        try:
-            ts = pd.to_datetime(dt, errors="coerce")
+    if dt is None or dt is pd.NaT:
+        return None
+    # Exact type checks first; plain datetimes are by far the most common input
+    t = type(dt)
+    if t is not datetime:
+        if t is pd.Timestamp:
+            if dt.tzinfo is not None:
+                return dt.tz_convert(tz)
+            dt = dt.to_pydatetime()
+        elif isinstance(dt, str):
+            if not dt:
+                return None
+            try:
+                ts = pd.to_datetime(dt, errors="coerce", format=dt_format)
+            except Exception:
+                return None
             if pd.isna(ts):
                 return None
-            return parse_local(ts.to_pydatetime(), tz)
-        except Exception:
+            dt = ts.to_pydatetime()
+        elif not isinstance(dt, datetime):
             return None
-    return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=tz)
+    return dt.astimezone(tz)
 
 
 def to_local(
     dt: Any,
-    tz: pytz.BaseTzInfo = TIMEZONE,
+    tz: tzinfo = TIMEZONE,
+    dt_format: Optional[str] = None,
 ) -> Optional[datetime]:
 
-    if isinstance(dt, pd.Timestamp):
-        dt = dt.to_pydatetime()
-    if isinstance(dt, datetime):
-        if dt.tzinfo is None:
-            dt = pytz.UTC.localize(dt)
-        try:
-            return dt.astimezone(tz)
-        except Exception:
-            return None
-    if isinstance(dt, str) and dt:
-        try:
-            ts = pd.to_datetime(dt, errors="coerce", utc=True)
+    if dt is None or dt is pd.NaT:
+        return None
+    t = type(dt)
+    if t is not datetime:
+        if t is pd.Timestamp:
+            dt = dt.to_pydatetime()
+        elif isinstance(dt, str):
+            if not dt:
+                return None
+            try:
+                ts = pd.to_datetime(dt, errors="coerce", utc=True, format=dt_format)
+            except Exception:
+                return None
             if pd.isna(ts):
                 return None
-            return to_local(ts.to_pydatetime(), tz)
-        except Exception:
+            dt = ts.to_pydatetime()
+        elif not isinstance(dt, datetime):
             return None
-    return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=_UTC)
+    try:
+        return dt.astimezone(tz)
+    except Exception:
+        return None
+
+@lru_cache(maxsize=1024)
+def _observer(latitude: float, longitude: float) -> Any:
+    # Astral observers only depend on the coordinate, so one is shared per location
+    return LocationInfo(latitude=latitude, longitude=longitude).observer
+
+# Spawned workers re-import pandas and this module (~2-3 s for a small pool) while astral
+# handles ~60 us per key, so a pool only pays off for tens of thousands of keys
+_PARALLEL_MIN_KEYS = 50_000
+
+def _astral_suntimes_ns(keys: List[Tuple[float, float, Any]]) -> List[Tuple[int, int]]:
+    # Astral sunrise/sunset as epoch nanoseconds per key; NaT sentinel when undefined
+    out = []
+    for lat, lon, day in keys:
+        try:
+            sun_times = sun.sun(_observer(lat, lon), date=day, tzinfo=_UTC)
+            out.append((
+                round(sun_times["sunrise"].timestamp() * 1e6) * 1000,
+                round(sun_times["sunset"].timestamp() * 1e6) * 1000,
+            ))
+        except Exception:
+            out.append((_NAT_NS, _NAT_NS))
+    return out
+
+def _astral_suntimes_ns_parallel(keys: List[Tuple[float, float, Any]]) -> List[Tuple[int, int]]:
+    # Astral is pure Python and holds the GIL, so the keys are spread over processes
+    n_workers = os.cpu_count() or 1
+    if n_workers < 2 or len(keys) < _PARALLEL_MIN_KEYS:
+        return _astral_suntimes_ns(keys)
+    size = -(-len(keys) // n_workers)
+    chunks = [keys[i:i + size] for i in range(0, len(keys), size)]
+    # Spawned, not forked: the parent may already run Arrow's reader threads
+    # Only pool startup is guarded; errors raised by the workers propagate
+    try:
+        pool = ProcessPoolExecutor(max_workers=len(chunks), mp_context=mp.get_context("spawn"))
+    except OSError:
+        return _astral_suntimes_ns(keys)
+    with pool:
+        try:
+            pool.submit(int).result()
+            started = True
+        except (OSError, BrokenProcessPool):
+            started = False
+        if started:
+            return [t for part in pool.map(_astral_suntimes_ns, chunks) for t in part]
+    # No usable worker processes (e.g. restricted sandbox); stay in-process
+    return _astral_suntimes_ns(keys)
+
+# Strings pandas.read_csv treats as missing by default
+_NA_STRINGS = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+    "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+
+def _dedupe_header(header: List[str]) -> List[str]:
+    # pandas' renaming of repeated column names: "a", "a.1", "a.2", ...
+    counts: Dict[str, int] = {}
+    names = []
+    for col in header:
+        cur = counts.get(col, 0)
+        while cur > 0:
+            counts[col] = cur + 1
+            col = f"{col}.{cur}"
+            cur = counts.get(col, 0)
+        names.append(col)
+        counts[col] = cur + 1
+    return names
+
+
+def _read_csv_arrow(path: str, sep: str) -> Optional["pa.Table"]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        header = next(csv.reader(f, delimiter=sep), [])
+    if not header:
+        return None
+    names = _dedupe_header(header)
+    try:
+        return pa_csv.read_csv(
+            path,
+            read_options=pa_csv.ReadOptions(column_names=names, skip_rows=1),
+            parse_options=pa_csv.ParseOptions(delimiter=sep, newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: pa.string() for name in names},
+                null_values=_NA_STRINGS,
+                strings_can_be_null=True,
+            ),
+        )
+    except (pa.ArrowInvalid, UnicodeDecodeError):
+        return None
+
+
+def read_csv(path: str, sep: str = ";") -> pd.DataFrame:
+    ##Read ``path`` with every column as str, via PyArrow's multi-threaded reader when available
+    table = _read_csv_arrow(path, sep) if _HAS_PYARROW else None
+    if table is None:
+        return pd.read_csv(path, sep=sep, dtype=str)
+    df = table.to_pandas()
+    for name, col in zip(table.column_names, table.columns):
+        # Arrow hands back missing text as None; pandas.read_csv uses NaN
+        if col.null_count:
+            missing = pc.is_null(col).to_numpy(zero_copy_only=False)
+            df[name] = np.where(missing, np.nan, df[name].to_numpy(dtype=object))
+    return df
+
+def ensure_dir(d: str) -> None:
+    ##Create directory ``d`` (and parents) unless it already exists
+    # A stat per call rather than a process-wide cache, so a removed directory is recreated
+    if d and not os.path.isdir(d):
+        os.makedirs(d, exist_ok=True)
+
+
+def _utc_offset_text(seconds: int) -> str:
+    sign = "-" if seconds < 0 else "+"
+    hours, rest = divmod(abs(int(seconds)), 3600)
+    minutes, secs = divmod(rest, 60)
+    text = f"{sign}{hours:02d}:{minutes:02d}"
+    return f"{text}:{secs:02d}" if secs else text
+
+
+def _aware_datetime_text(s: pd.Series) -> np.ndarray:
+    ##str(Timestamp) for every value of a tz-aware column, built from NumPy arrays
+    wall = s.dt.tz_localize(None).to_numpy(dtype="datetime64[ns]")
+    utc = s.dt.tz_convert(_UTC).dt.tz_localize(None).to_numpy(dtype="datetime64[ns]")
+    wall_ns = wall.view(np.int64)
+    # Fractional seconds are printed per value, and only when present
+    frac = wall_ns % 1_000_000_000
+    text = np.where(
+        frac == 0,
+        np.datetime_as_string(wall, unit="s"),
+        np.where(
+            frac % 1000 == 0,
+            np.datetime_as_string(wall, unit="us"),
+            np.datetime_as_string(wall, unit="ns"),
+        ),
+    )
+    text = np.char.replace(text, "T", " ")
+    offsets, inverse = np.unique((wall_ns - utc.view(np.int64)) // 1_000_000_000, return_inverse=True)
+    labels = np.array([_utc_offset_text(o) for o in offsets], dtype=str)
+    out = np.char.add(text, labels[inverse.reshape(-1)]).astype(object)
+    out[s.isna().to_numpy()] = None
+    return out
+
+
+def _csv_text_frame(df: pd.DataFrame) -> pd.DataFrame:
+    ##Columns rendered as the text DataFrame.to_csv writes, missing values as None
+    columns = {}
+    for i in range(df.shape[1]):
+        col = df.iloc[:, i]
+        if isinstance(col.dtype, pd.StringDtype):
+            columns[i] = col
+        elif isinstance(col.dtype, pd.DatetimeTZDtype):
+            columns[i] = _aware_datetime_text(col)
+        else:
+            columns[i] = col.astype(str).where(col.notna(), None)
+    return pd.DataFrame(columns, index=df.index)
+
+
+def _arrow_writable(df: pd.DataFrame, header: List[str], sep: str) -> bool:
+    ##Whether _csv_text_frame plus Arrow's writer reproduces DataFrame.to_csv for ``df``
+    # A single column's missing value is an empty line to Arrow but '""' to pandas
+    if not len(df) or df.shape[1] < 2 or isinstance(df.columns, pd.MultiIndex):
+        return False
+    if any(sep in h or '"' in h or "\n" in h or "\r" in h for h in header):
+        return False
+    for i in range(df.shape[1]):
+        col = df.iloc[:, i]
+        # _aware_datetime_text works on nanoseconds; other units may not fit
+        if isinstance(col.dtype, pd.DatetimeTZDtype) and col.dtype.unit != "ns":
+            return False
+        # str() of bytes and other objects need not match to_csv's rendering
+        if col.dtype == object and pd.api.types.infer_dtype(col, skipna=True) not in ("string", "empty"):
+            return False
+    return True
+
+
+def write_csv(df: pd.DataFrame, path: str, sep: str = ";") -> None:
+    ##Write ``df`` as ``df.to_csv(path, index=False, sep=sep, na_rep="")`` would, via PyArrow's writer when possible
+    header = [str(c) for c in df.columns]
+    if _HAS_PYARROW and _arrow_writable(df, header, sep):
+        try:
+            table = pa.Table.from_pandas(_csv_text_frame(df), preserve_index=False)
+            # Without quoting, Arrow rejects values that would need it; pandas quotes those
+            with open(path, "wb") as f:
+                f.write((sep.join(header) + "\n").encode("utf-8"))
+                pa_csv.write_csv(
+                    table,
+                    f,
+                    write_options=pa_csv.WriteOptions(
+                        include_header=False, delimiter=sep, quoting_style="none"
+                    ),
+                )
+            return
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+    df.to_csv(path, index=False, sep=sep, na_rep="")
+
+def compute_suntimes_numpy(
+    lats: Any,
+    lons: Any,
+    dates: Any,
+    tz: tzinfo = TIMEZONE,
+    parallel: bool = False,
+) -> Tuple[pd.DatetimeIndex, pd.DatetimeIndex]:
+    ##Sunrise and sunset (in ``tz``) for parallel arrays of latitudes, longitudes and dates
+    ##``parallel=True`` spreads large astral workloads over worker processes
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    days = pd.to_datetime(pd.Index(dates), errors="coerce")
+    nan_mask = np.isnan(lats) | np.isnan(lons) | days.isna()
+
+    if _HAS_ASTRAL:
+        #Use Astral when available, once per distinct (lat, lon, date).
+        #Times are kept as epoch nanoseconds and converted to ``tz`` in one go.
+        day_objs = days.date
+        lat_keys = np.round(lats, 4)
+        lon_keys = np.round(lons, 4)
+        suntimes_ns = np.full((len(lats), 2), _NAT_NS, dtype=np.int64)
+        # Rows with a missing input keep the NaT fill value
+        rows = np.flatnonzero(~nan_mask)
+        key_index: Dict[Tuple[float, float, Any], int] = {}
+        row_keys = np.empty(len(rows), dtype=np.intp)
+        for j, i in enumerate(rows):
+            key = (float(lat_keys[i]), float(lon_keys[i]), day_objs[i])
+            row_keys[j] = key_index.setdefault(key, len(key_index))
+        if key_index:
+            astral_ns = _astral_suntimes_ns_parallel if parallel else _astral_suntimes_ns
+            unique_ns = np.array(astral_ns(list(key_index)), dtype=np.int64)
+            suntimes_ns[rows] = unique_ns[row_keys]
+
+        sunrise_utc = pd.to_datetime(suntimes_ns[:, 0], unit="ns", utc=True)
+        sunset_utc = pd.to_datetime(suntimes_ns[:, 1], unit="ns", utc=True)
+    else:
+        #Fallback to the NOAA approximation, computed for all rows at once
+        sunrise_utc, sunset_utc = noaa_sunrise_sunset(days, lats, lons)
+
+    return sunrise_utc.tz_convert(tz), sunset_utc.tz_convert(tz)
 
 def get_fieldvisit_suntimes(
     observations: pd.DataFrame,
@@ -141,89 +432,77 @@ def get_fieldvisit_suntimes(
     outfile: Optional[str] = None,
 ) -> pd.DataFrame:
 
-    # Project city names and IDs
-    projects_df = projects[["ID", "Stad", "Naam"]].rename(
-        columns={"ID": "Project_ID"}
+    if project_id_col != "project_id":
+        warnings.warn(
+            "get_fieldvisit_suntimes: project_id_col is ignored and will be removed; "
+            "visits are matched to projects through the observations",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+
+    # Project city names, indexed by project ID; _project_row keeps the projects order
+    projects_df = (
+        projects[["ID", "Stad", "Naam"]]
+        .rename(columns={"ID": "Project_ID"})
+        .assign(_project_row=np.arange(len(projects)))
+        .set_index("Project_ID")
     )
 
     #Take first coordinate per field visit
     unique_gps = (
-        observations.dropna(subset=[coord_col])
-        .groupby(fieldvisit_id_col_obs)
-        .first()
-        .reset_index()
+        observations.dropna(subset=[coord_col, fieldvisit_id_col_obs])
+        .drop_duplicates(subset=[fieldvisit_id_col_obs], keep="first")
         [[fieldvisit_id_col_obs, project_id_col_obs, coord_col]]
         .rename(columns={
             fieldvisit_id_col_obs: "Veldbezoek_ID",
             project_id_col_obs: "Project_ID",
         })
+        .set_index("Project_ID")
     )
 
-    project_cities_gps = pd.merge(
-        projects_df,
-        unique_gps,
-        on="Project_ID",
-        how="inner",
+    project_cities_gps = (
+        unique_gps.join(projects_df, how="inner", sort=False)
+        .reset_index()
+        .set_index("Veldbezoek_ID")
     )
 
+    # Visit dates, indexed by field visit ID
     fieldvisit_dates = (
-        fieldvisits[[fieldvisit_id_col, project_id_col, "Startdatum"]]
-        .rename(columns={
-            fieldvisit_id_col: "Veldbezoek_ID",
-            project_id_col: "Project_ID",
-        })
+        fieldvisits[[fieldvisit_id_col, "Startdatum"]]
+        .rename(columns={fieldvisit_id_col: "Veldbezoek_ID"})
+        .assign(_visit_row=np.arange(len(fieldvisits)))
+        .set_index("Veldbezoek_ID")
     )
 
     fieldvisit_dates["Datum"] = pd.to_datetime(
-        fieldvisit_dates["Startdatum"], errors="coerce"
+        fieldvisit_dates["Startdatum"], errors="coerce", format="ISO8601", cache=True
     ).dt.date
 
-    loc_date = pd.merge(
-        project_cities_gps,
-        fieldvisit_dates[["Veldbezoek_ID", "Datum"]],
-        on="Veldbezoek_ID",
-        how="inner",
+    loc_date = project_cities_gps.join(
+        fieldvisit_dates[["Datum", "_visit_row"]], how="inner", sort=False
+    ).reset_index()
+    # Rows in the order the former merges gave: projects order, then visit ID, then field visit row
+    loc_date = loc_date.sort_values(
+        ["_project_row", "Veldbezoek_ID", "_visit_row"], kind="stable", ignore_index=True
     )
 
     # Split coordinates into lat/lon
-    loc_date[["lat", "lon"]] = (
-        loc_date[coord_col].str.split(",", expand=True).iloc[:, :2]
+    lat_lon = loc_date[coord_col].str.extract(
+        r"\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)"
     )
-    loc_date["lat"] = pd.to_numeric(loc_date["lat"], errors="coerce")
-    loc_date["lon"] = pd.to_numeric(loc_date["lon"], errors="coerce")
+    loc_date["lat"] = pd.to_numeric(lat_lon[0], errors="coerce")
+    loc_date["lon"] = pd.to_numeric(lat_lon[1], errors="coerce")
 
     # Compute sunrise and sunset
-    sunrise_list: List[Optional[datetime]] = []
-    sunset_list: List[Optional[datetime]] = []
-    for _, row in loc_date.iterrows():
-        lat, lon, dt = row["lat"], row["lon"], row["Datum"]
-        if pd.isna(lat) or pd.isna(lon) or pd.isna(dt):
-            sunrise_list.append(None)
-            sunset_list.append(None)
-            continue
-        try:
-            if _HAS_ASTRAL:
-                #Use Astral when available
-                location = LocationInfo(latitude=lat, longitude=lon)
-                sun_times = sun.sun(location.observer, date=dt, tzinfo=pytz.UTC)
-                sr = to_local(sun_times["sunrise"], TIMEZONE)
-                ss = to_local(sun_times["sunset"], TIMEZONE)
-            else:
-                #Fallback to the NOAA approximation
-                sr, ss = _fallback_sunrise_sunset(dt, lat, lon, TIMEZONE)
-            sunrise_list.append(sr)
-            sunset_list.append(ss)
-        except Exception:
-            sunrise_list.append(None)
-            sunset_list.append(None)
-
-    loc_date["sunrise"] = sunrise_list
-    loc_date["sunset"] = sunset_list
+    loc_date["sunrise"], loc_date["sunset"] = compute_suntimes_numpy(
+        loc_date["lat"].to_numpy(),
+        loc_date["lon"].to_numpy(),
+        loc_date["Datum"].to_numpy(),
+    )
 
     result = loc_date[["Project_ID", "Naam", "Veldbezoek_ID", "Stad", coord_col, "sunrise", "sunset"]]
 
     if outfile:
-        import os
-        os.makedirs(os.path.dirname(outfile), exist_ok=True)
-        result.to_csv(outfile, index=False, sep=";")
+        ensure_dir(os.path.dirname(outfile))
+        write_csv(result, outfile, sep=";")
     return result
@@ -1,69 +1,169 @@
 from __future__ import annotations
 import os
 import re
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta, time, date
-import pytz
+from datetime import datetime, time, date, timezone, tzinfo
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    # Python < 3.9
+    from backports.zoneinfo import ZoneInfo
 
 try:
     from fieldvisit_utils import TIMEZONE
 except Exception:
     # Fallback timezone
-    TIMEZONE = pytz.timezone("Europe/Amsterdam")
+    TIMEZONE = ZoneInfo("Europe/Amsterdam")
 
 from fieldvisit_utils import get_fieldvisit_suntimes as compute_suntimes
+from fieldvisit_utils import noaa_sunrise_sunset
+from fieldvisit_utils import read_csv, write_csv, ensure_dir
 from timesuggest_utils import get_fieldvisit_time_suggest as compute_time_suggest
 from timesuggest_utils import flag_fieldtime_changes as compute_flag_fieldtime_changes
 
-def parse_local(dt: Any, tz: pytz.BaseTzInfo = TIMEZONE) -> Optional[datetime]:
-
+# Patterns used on every row; compiled once
+_PROJECT_CODE_RE = re.compile(r"([VW]M[- ]?\d+|GZ|ZR|HM|Uitvliegtelling)", re.IGNORECASE)
+_DAGDEEL_RE = re.compile(r"(avond|ochtend)\s*([0-9]+|I{1,3})?", re.IGNORECASE)
+_VM01_RE = re.compile(r"VM01", re.IGNORECASE)
+_VM02_RE = re.compile(r"VM02", re.IGNORECASE)
+_GZ_RE = re.compile(r"GZ", re.IGNORECASE)
+_ZR_RE = re.compile(r"ZR", re.IGNORECASE)
+
+# check_data categories; code 1 means the visit needs a manual check
+_CHECK_LEVELS = ["no", "yes"]
+
+# Rule codes for _sun_window, combined as bit flags per row
+_VM01_AVOND = 1
+_VM01_OCHTEND = 2
+_GZ = 4
+_ZR = 8
+_NAT_NS = np.iinfo(np.int64).min
+_HOUR_NS = 3_600_000_000_000
+_MINUTE_NS = 60_000_000_000
+
+def parse_local(dt: Any, tz: tzinfo = TIMEZONE) -> Optional[datetime]:
+
+    if dt is None or dt is pd.NaT:
+        return None
+    if isinstance(dt, str):
+        if not dt:
+            return None
+        try:
+            dt = pd.to_datetime(dt, errors="coerce")
+        except Exception:
+            return None
+        if pd.isna(dt):
+            return None
     if isinstance(dt, pd.Timestamp):
         if dt.tzinfo is None:
-            # Treat stored clock time as local
-            return tz.localize(dt.to_pydatetime())
+            # Treat stored clock time as local; ambiguous/nonexistent resolve as fold=0
+            return dt.tz_localize(tz, ambiguous=True, nonexistent=pd.Timedelta(hours=1))
         return dt.tz_convert(tz)
     elif isinstance(dt, datetime):
         if dt.tzinfo is None:
-            return tz.localize(dt)
+            return dt.replace(tzinfo=tz)
         return dt.astimezone(tz)
-    elif isinstance(dt, str) and dt:
-        try:
-            ts = pd.to_datetime(dt, errors="coerce")
-            if pd.isna(ts):
-                return None
-            return parse_local(ts.to_pydatetime(), tz)
-        except Exception:
-            return None
     return None
 
 
-def to_local(dt: Any, tz: pytz.BaseTzInfo = TIMEZONE) -> Optional[datetime]:
+def to_local(dt: Any, tz: tzinfo = TIMEZONE) -> Optional[datetime]:
     ##Convert a timestamp to the given timezone
+    if dt is None or dt is pd.NaT:
+        return None
+    if isinstance(dt, str):
+        if not dt:
+            return None
+        try:
+            dt = pd.to_datetime(dt, errors="coerce", utc=True)
+        except Exception:
+            return None
+        if pd.isna(dt):
+            return None
     if isinstance(dt, pd.Timestamp):
-        dt = dt.to_pydatetime()
-
-    if isinstance(dt, datetime):
-
         if dt.tzinfo is None:
-            dt = pytz.UTC.localize(dt)
+            dt = dt.tz_localize(timezone.utc)
         try:
-            return dt.astimezone(tz)
+            return dt.tz_convert(tz)
         except Exception:
             return None
-
-    if isinstance(dt, str) and dt:
+    elif isinstance(dt, datetime):
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
         try:
-            ts = pd.to_datetime(dt, errors="coerce", utc=True)
-            if pd.isna(ts):
-                return None
-            return to_local(ts.to_pydatetime(), tz)
+            return dt.astimezone(tz)
         except Exception:
             return None
     return None
 
 
+@lru_cache(maxsize=None)
+def _remove_pattern(patterns: Tuple[str, ...]) -> "re.Pattern[str]":
+    # One compiled alternation per distinct pattern list, shared by all callers
+    return re.compile("|".join(patterns), re.IGNORECASE)
+
+
+def _rows_removed(names: pd.Series, remove_patterns: Optional[Iterable[str]]) -> Any:
+    ##"remove" where a name matches any of ``remove_patterns``, else "keep"
+    patterns = tuple(remove_patterns or ())
+    if not patterns:
+        return "keep"
+    return np.where(names.fillna("").str.contains(_remove_pattern(patterns)), "remove", "keep")
+
+
+def _sun_window(
+    codes: np.ndarray,
+    start: np.ndarray,
+    end: np.ndarray,
+    sunrise: np.ndarray,
+    sunset: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # VM01/GZ/ZR windows around sunrise/sunset on epoch nanoseconds; NaT is _NAT_NS.
+    # Each rule is (bit, reference, (start low, start high, start fix), (end low, end high, end fix))
+    # relative to the reference; rules apply in order, each to the times the previous one left.
+    rules = (
+        (_VM01_AVOND, sunset, (-_HOUR_NS, 0, 0), (3 * _HOUR_NS, 4 * _HOUR_NS, 3 * _HOUR_NS)),
+        (_VM01_OCHTEND, sunrise, (-4 * _HOUR_NS, -3 * _HOUR_NS, -3 * _HOUR_NS), (0, 4 * _HOUR_NS, 0)),
+        (_GZ, sunset, (-150 * _MINUTE_NS, -90 * _MINUTE_NS, -90 * _MINUTE_NS),
+         (30 * _MINUTE_NS, 90 * _MINUTE_NS, 30 * _MINUTE_NS)),
+        (_ZR, sunrise, (-150 * _MINUTE_NS, -90 * _MINUTE_NS, -90 * _MINUTE_NS),
+         (30 * _MINUTE_NS, 90 * _MINUTE_NS, 30 * _MINUTE_NS)),
+    )
+    has_s = start != _NAT_NS
+    has_e = end != _NAT_NS
+    for bit, ref, (s_lo, s_hi, s_fix), (e_lo, e_hi, e_fix) in rules:
+        rows = ((codes & bit) != 0) & (ref != _NAT_NS)
+        start = np.where(rows & has_s & ((start < ref + s_lo) | (start > ref + s_hi)), ref + s_fix, start)
+        end = np.where(rows & has_e & ((end < ref + e_lo) | (end > ref + e_hi)), ref + e_fix, end)
+    return start, end
+
+
+def _parse_local_series(s: pd.Series, tz: tzinfo = TIMEZONE) -> pd.Series:
+    ##Column-wise parse_local: naive values are local clock time, aware values are converted
+    values = None
+    if s.dtype != object or pd.api.types.infer_dtype(s, skipna=True) in ("string", "empty"):
+        try:
+            values = pd.to_datetime(s, errors="coerce")
+        except (TypeError, ValueError):
+            values = None
+    if values is None or not pd.api.types.is_datetime64_any_dtype(values):
+        # Python datetimes or mixed-offset strings may mix naive and aware values
+        return pd.to_datetime(s.apply(parse_local, tz=tz), utc=True).dt.tz_convert(tz)
+    if values.dt.tz is not None:
+        return values.dt.tz_convert(tz)
+    # Ambiguous/nonexistent clock times resolve as datetime's fold=0 does
+    return values.dt.tz_localize(
+        tz, ambiguous=np.ones(len(values), dtype=bool), nonexistent=pd.Timedelta(hours=1)
+    )
+
+
+def _to_local_series(s: pd.Series, tz: tzinfo = TIMEZONE) -> pd.Series:
+    ##Column-wise to_local: naive values are UTC
+    return pd.to_datetime(s, errors="coerce", utc=True).dt.tz_convert(tz)
+
+
 def get_fieldvisit_suntimes(
     observations: pd.DataFrame,
     fieldvisits: pd.DataFrame,
@@ -82,10 +182,8 @@ def get_fieldvisit_suntimes(
 
     # Take first coordinate per field visit
     unique_gps = (
-        observations.dropna(subset=[coord_col])
-        .groupby(fieldvisit_id_col_obs)
-        .first()
-        .reset_index()
+        observations.dropna(subset=[coord_col, fieldvisit_id_col_obs])
+        .drop_duplicates(subset=[fieldvisit_id_col_obs], keep="first")
         [[fieldvisit_id_col_obs, project_id_col_obs, coord_col]]
         .rename(columns={
             fieldvisit_id_col_obs: "Veldbezoek_ID",
@@ -118,38 +216,25 @@ def get_fieldvisit_suntimes(
         on="Veldbezoek_ID",
         how="inner",
     )
-    #Split coordinates into lat/lon
-    loc_date[["lat", "lon"]] = loc_date[coord_col].str.split(",", expand=True).iloc[:, :2]
-    loc_date["lat"] = pd.to_numeric(loc_date["lat"], errors="coerce")
-    loc_date["lon"] = pd.to_numeric(loc_date["lon"], errors="coerce")
-
-    #Compute sunrise and sunset per row
-    sunrise_list: List[Optional[datetime]] = []
-    sunset_list: List[Optional[datetime]] = []
-    for _, row in loc_date.iterrows():
-        lat, lon, dt = row["lat"], row["lon"], row["Datum"]
-        if pd.isna(lat) or pd.isna(lon) or pd.isna(dt):
-            sunrise_list.append(None)
-            sunset_list.append(None)
-            continue
-        try:
-            location = LocationInfo(latitude=lat, longitude=lon)
-            sun_times = sun.sun(location.observer, date=dt, tzinfo=pytz.UTC)
-
-            sunrise_list.append(to_local(sun_times["sunrise"], TIMEZONE))
-            sunset_list.append(to_local(sun_times["sunset"], TIMEZONE))
-        except Exception:
-            sunrise_list.append(None)
-            sunset_list.append(None)
-
-    loc_date["sunrise"] = sunrise_list
-    loc_date["sunset"] = sunset_list
+    #Split coordinates into lat/lon; anything after a second comma is ignored
+    parts = loc_date[coord_col].str.split(",", n=2, expand=True).reindex(columns=[0, 1])
+    loc_date["lat"] = pd.to_numeric(parts[0], errors="coerce")
+    loc_date["lon"] = pd.to_numeric(parts[1], errors="coerce")
+
+    #Compute sunrise and sunset for all rows at once with the NOAA approximation
+    sunrise_utc, sunset_utc = noaa_sunrise_sunset(
+        loc_date["Datum"].to_numpy(),
+        loc_date["lat"].to_numpy(np.float64),
+        loc_date["lon"].to_numpy(np.float64),
+    )
+    loc_date["sunrise"] = sunrise_utc.tz_convert(TIMEZONE)
+    loc_date["sunset"] = sunset_utc.tz_convert(TIMEZONE)
 
     result = loc_date[["Project_ID", "Naam", "Veldbezoek_ID", "Stad", coord_col, "sunrise", "sunset"]]
 
     if outfile:
-        os.makedirs(os.path.dirname(outfile), exist_ok=True)
-        result.to_csv(outfile, index=False, sep=";")
+        ensure_dir(os.path.dirname(outfile))
+        write_csv(result, outfile, sep=";")
     return result
 
 
@@ -160,65 +245,36 @@ def naam_veldbezoeken_schoon(
 ) -> pd.DataFrame:
     ## Normalize and clean field visit names
 
-    df = df.copy()
+    df = df.copy(deep=False)
     names = df[naam_col].fillna("")
 
     # Extract project codes
-    project_match = names.str.extract(r"(?i)([VW]M[- ]?\d+|GZ|ZR|HM|Uitvliegtelling)")
+    project_match = names.str.extract(_PROJECT_CODE_RE)
     project = project_match[0].str.upper().str.replace("[- ]", "", regex=True)
     project = project.str.replace(r"^WM", "VM", regex=True)
     project = project.str.replace(r"^VM(\d)$", lambda m: f"VM0{m.group(1)}", regex=True)
 
     # Extract day part
-    dagdeel_match = names.str.extract(r"(?i)(avond|ochtend)\s*([0-9]+|I{1,3})?")
+    dagdeel_match = names.str.extract(_DAGDEEL_RE)
     dagdeel_type = dagdeel_match[0].str.lower()
     dagdeel_num_raw = dagdeel_match[1]
 
-    # Normalize numerals
-    def normalize_dagdeel_num(x: str) -> Optional[str]:
-        if pd.isna(x) or x == "":
-            return None
-        roman_map = {"i": "1", "ii": "2", "iii": "3"}
-        x_lower = x.lower()
-        if x_lower in roman_map:
-            return roman_map[x_lower]
-        try:
-            return str(int(x))
-        except ValueError:
-            return None
-
-    dagdeel_num = dagdeel_num_raw.apply(normalize_dagdeel_num)
-
-    dagdeel = []
-    for t, n in zip(dagdeel_type, dagdeel_num):
-        if pd.isna(t) or t == "":
-            dagdeel.append(None)
-        elif pd.isna(n) or n is None:
-            dagdeel.append(t)
-        else:
-            dagdeel.append(f"{t} {n}")
+    # Normalize numerals: roman I-III to digits, leading zeros dropped
+    numeral = dagdeel_num_raw.str.lower()
+    dagdeel_num = numeral.map({"i": "1", "ii": "2", "iii": "3"}).fillna(
+        numeral.str.lstrip("0").replace("", "0")
+    )
 
+    # "<type> <num>", just "<type>" without a number, None without a day part
+    dagdeel = (dagdeel_type + " " + dagdeel_num).fillna(dagdeel_type)
     df["Project"] = project
-    df["Dagdeel"] = dagdeel
-
-    naam_schoon: List[Optional[str]] = []
-    for prj, dd in zip(project, dagdeel):
-        if prj is None or prj == "":
-            naam_schoon.append(None)
-        elif dd is None or dd == "":
-            naam_schoon.append(prj)
-        else:
-            naam_schoon.append(f"{prj} {dd}")
-    df["Naam_schoon"] = naam_schoon
+    df["Dagdeel"] = dagdeel.astype(object).where(dagdeel.notna(), None)
+
+    naam_schoon = (project + " " + dagdeel).fillna(project)
+    df["Naam_schoon"] = naam_schoon.astype(object).where(naam_schoon.notna(), None)
 
     #Determine rows to remove
-    if remove_patterns:
-        pattern = re.compile("|".join(remove_patterns), re.IGNORECASE)
-        df["Rows_Removed"] = np.where(
-            df[naam_col].fillna("").str.contains(pattern), "remove", "keep"
-        )
-    else:
-        df["Rows_Removed"] = "keep"
+    df["Rows_Removed"] = _rows_removed(df[naam_col], remove_patterns)
 
     return df
 
@@ -226,146 +282,103 @@ def naam_veldbezoeken_schoon(
 def get_fieldvisit_timesuggest(df: pd.DataFrame) -> pd.DataFrame:
     ##Suggest start and end times for field visits
 
-    df = df.copy()
+    df = df.copy(deep=False)
 
     # Convert to local times
-    df["Starttijd_Suggest"] = df["Startdatum"].apply(parse_local)
-    df["Eindtijd_Suggest"] = df["Einddatum"].apply(parse_local)
-    df["sunset_local"] = df["sunset"].apply(lambda x: to_local(x) if not pd.isna(x) else None)
-    df["sunrise_local"] = df["sunrise"].apply(lambda x: to_local(x) if not pd.isna(x) else None)
+    df["Starttijd_Suggest"] = _parse_local_series(df["Startdatum"])
+    df["Eindtijd_Suggest"] = _parse_local_series(df["Einddatum"])
+    df["sunset_local"] = _to_local_series(df["sunset"])
+    df["sunrise_local"] = _to_local_series(df["sunrise"])
     df["duur_suggest"] = np.nan
 
-    def update_time(dt: datetime, hour: int, minute: int, second: int = 0) -> datetime:
-        return dt.replace(hour=hour, minute=minute, second=second)
+    def _at_time(s: pd.Series, hour: int, minute: int) -> pd.Series:
+        # Same local day at hour:minute; seconds cleared, sub-second part kept.
+        # Wall times in the spring DST gap move an hour forward; ambiguous ones keep summer time
+        wall = s.dt.tz_localize(None)
+        wall = wall.dt.normalize() + pd.Timedelta(hours=hour, minutes=minute) + (wall - wall.dt.floor("s"))
+        return wall.dt.tz_localize(
+            TIMEZONE, ambiguous=np.ones(len(s), dtype=bool), nonexistent=pd.Timedelta(hours=1)
+        )
 
-    df["start_min"] = df["Starttijd_Suggest"].apply(
-        lambda x: x.hour * 60 + x.minute if isinstance(x, datetime) else np.nan
+    def _str_values(col: str) -> pd.Series:
+        if col not in df.columns:
+            return pd.Series("", index=df.index)
+        return df[col].fillna("").astype(str)
+
+    start = df["Starttijd_Suggest"]
+    end = df["Eindtijd_Suggest"]
+    sunset_local = df["sunset_local"]
+    sunrise_local = df["sunrise_local"]
+
+    df["start_min"] = start.dt.hour * 60 + start.dt.minute
+    df["end_min"] = end.dt.hour * 60 + end.dt.minute
+
+    proj = _str_values("Project")
+    dagdeel = _str_values("Dagdeel")
+    avond = dagdeel.str.startswith("avond")
+    ochtend = dagdeel.str.startswith("ochtend")
+    is_vm01 = proj.str.match(_VM01_RE)
+    is_vm02 = proj.str.fullmatch(_VM02_RE)
+    is_gz = proj.str.contains(_GZ_RE)
+    is_zr = proj.str.contains(_ZR_RE)
+
+    # VM01, GZ and ZR only move times relative to sunrise/sunset; VM02 rows match none
+    # of them and are handled below. _sun_window keeps each row's rules in order.
+    codes = (
+        np.where(is_vm01 & avond, _VM01_AVOND, 0)
+        | np.where(is_vm01 & ochtend, _VM01_OCHTEND, 0)
+        | np.where(is_gz, _GZ, 0)
+        | np.where(is_zr, _ZR, 0)
+    ).astype(np.int64)
+
+    def _ns(s: pd.Series) -> np.ndarray:
+        return s.to_numpy("datetime64[ns]").view(np.int64)
+
+    def _from_ns(values: np.ndarray) -> pd.Series:
+        return pd.Series(pd.to_datetime(values, utc=True), index=df.index).dt.tz_convert(TIMEZONE)
+
+    start_ns, end_ns = _sun_window(
+        codes, _ns(start), _ns(end), _ns(sunrise_local), _ns(sunset_local)
     )
-    df["end_min"] = df["Eindtijd_Suggest"].apply(
-        lambda x: x.hour * 60 + x.minute if isinstance(x, datetime) else np.nan
+    start = _from_ns(start_ns)
+    end = _from_ns(end_ns)
+
+    # VM02 evening start time must be 22:59–23:59
+    m = is_vm02 & avond
+    start_min = start.dt.hour * 60 + start.dt.minute
+    start = start.mask(
+        m & ((start_min < 22 * 60 + 59) | (start_min > 23 * 60 + 59)), _at_time(start, 23, 59)
     )
-
-    results_start = []
-    results_end = []
-    results_dur = []
-    for idx, row in df.iterrows():
-        # Extract project and day part
-        proj_val = row.get("Project")
-        if isinstance(proj_val, str):
-            proj = proj_val
-        elif pd.isna(proj_val):
-            proj = ""
-        else:
-            proj = str(proj_val)
-        dagdeel_val = row.get("Dagdeel")
-        if isinstance(dagdeel_val, str):
-            dagdeel = dagdeel_val
-        elif pd.isna(dagdeel_val):
-            dagdeel = ""
-        else:
-            dagdeel = str(dagdeel_val)
-        start = row.get("Starttijd_Suggest")
-        end = row.get("Eindtijd_Suggest")
-        sunset_local = row.get("sunset_local")
-        sunrise_local = row.get("sunrise_local")
-
-        # Evening adjustments
-        if re.match(r"VM01", proj, flags=re.IGNORECASE) and dagdeel.startswith("avond"):
-            if start and sunset_local:
-                if start > sunset_local or start < sunset_local - timedelta(hours=1):
-                    start = sunset_local
-            if end and sunset_local:
-                three_h = sunset_local + timedelta(hours=3)
-                four_h = sunset_local + timedelta(hours=4)
-                if end < three_h or end > four_h:
-                    end = three_h
-
-        # Morning adjustments
-        if re.match(r"VM01", proj, flags=re.IGNORECASE) and dagdeel.startswith("ochtend"):
-            if end and sunrise_local:
-                start_of_window = sunrise_local
-                end_of_window = sunrise_local + timedelta(hours=4)
-                if end < start_of_window or end > end_of_window:
-                    end = start_of_window
-            if start and sunrise_local:
-                start_window = sunrise_local - timedelta(hours=4)
-                end_window = sunrise_local - timedelta(hours=3)
-                if start < start_window or start > end_window:
-                    start = sunrise_local - timedelta(hours=3)
-
-        # VM02 evening start time must be 22:59–23:59
-        if re.fullmatch(r"VM02", proj, flags=re.IGNORECASE) and dagdeel.startswith("avond"):
-            if start:
-                start_min = start.hour * 60 + start.minute
-                lower = 22 * 60 + 59
-                upper = 23 * 60 + 59
-                if start_min < lower or start_min > upper:
-                    start = update_time(start, 23, 59, 0)
-            # If end is not after start, move to next day
-            if start and end and end <= start:
-                end = end + timedelta(days=1)
-            # End must be within 02:00–03:00 on following day
-            if end:
-                end_min = end.hour * 60 + end.minute
-                if end_min < 2 * 60:
-                    end = update_time(end, 2, 0, 0)
-                elif end_min > 3 * 60:
-                    end = update_time(end, 3, 0, 0)
-
-        # GZ: evening visits relative to sunset
-        if re.search(r"GZ", proj, flags=re.IGNORECASE):
-            if start and sunset_local:
-                lower = sunset_local - timedelta(minutes=150)
-                upper = sunset_local - timedelta(minutes=90)
-                if start > upper or start < lower:
-                    start = sunset_local - timedelta(minutes=90)
-            if end and sunset_local:
-                lower = sunset_local + timedelta(minutes=30)
-                upper = sunset_local + timedelta(minutes=90)
-                if end < lower or end > upper:
-                    end = sunset_local + timedelta(minutes=30)
-
-        # ZR: morning visits relative to sunrise (1.5h before to 0.5h after)
-        if re.search(r"ZR", proj, flags=re.IGNORECASE):
-            if start and sunrise_local:
-                lower = sunrise_local - timedelta(minutes=150)
-                upper = sunrise_local - timedelta(minutes=90)
-                if start > upper or start < lower:
-                    start = sunrise_local - timedelta(minutes=90)
-            if end and sunrise_local:
-                lower = sunrise_local + timedelta(minutes=30)
-                upper = sunrise_local + timedelta(minutes=90)
-                if end < lower or end > upper:
-                    end = sunrise_local + timedelta(minutes=30)
-
-        # Compute duration if both start and end present
-        if start and end:
-            duration = (end - start).total_seconds() / 3600.0
-        else:
-            duration = np.nan
-
-        results_start.append(start)
-        results_end.append(end)
-        results_dur.append(duration)
-
-    df["Starttijd_Suggest"] = results_start
-    df["Eindtijd_Suggest"] = results_end
-    df["duur_suggest"] = results_dur
+    # If end is not after start, move to next day
+    end = end.mask(m & (end <= start), end + pd.Timedelta(days=1))
+    # End must be within 02:00–03:00 on following day
+    end_min = end.dt.hour * 60 + end.dt.minute
+    end = end.mask(m & (end_min < 2 * 60), _at_time(end, 2, 0))
+    end = end.mask(m & (end_min > 3 * 60), _at_time(end, 3, 0))
+
+    df["Starttijd_Suggest"] = start
+    df["Eindtijd_Suggest"] = end
+    start_ns = _ns(start)
+    end_ns = _ns(end)
+    missing = (start_ns == _NAT_NS) | (end_ns == _NAT_NS)
+    df["duur_suggest"] = np.where(missing, np.nan, (end_ns - start_ns) / 1e9 / 3600.0)
 
     return df
 
 
 def flag_fieldtime_changes(df: pd.DataFrame) -> pd.DataFrame:
     ##Flag field visits that require manual data checks
-    df = df.copy()
-    naam_missing = df["Naam_schoon"].isna() | (df["Naam_schoon"].str.strip() == "")
-    check_mask = (
-        df["Project"].fillna("").str.contains(r"^VM03", case=False) |
-        df["sunrise"].isna() |
-        df["sunset"].isna() |
-        naam_missing
-    )
-    df["check_data"] = np.where(check_mask, "yes", "no")
+    df = df.copy(deep=False)
+    naam = df["Naam_schoon"]
+    vm03 = df["Project"].fillna("").str.upper().str.startswith("VM03", na=False).to_numpy(dtype=bool)
+    # OR the conditions as plain arrays into one buffer; no intermediate Series
+    check_mask = np.empty(len(df), dtype=bool)
+    np.logical_or(naam.isna().to_numpy(), (naam.str.strip() == "").to_numpy(dtype=bool), out=check_mask)
+    np.logical_or(check_mask, vm03, out=check_mask)
+    np.logical_or(check_mask, df["sunrise"].isna().to_numpy(), out=check_mask)
+    np.logical_or(check_mask, df["sunset"].isna().to_numpy(), out=check_mask)
+    # Two-level categorical over the mask bytes themselves (no copy); reads and writes as "yes"/"no"
+    df["check_data"] = pd.Categorical.from_codes(check_mask.view(np.int8), categories=_CHECK_LEVELS)
     return df
 
 
@@ -379,9 +392,9 @@ def transform_fieldvisits(
 ) -> pd.DataFrame:
     ##Final summary each field visit
     # Load CSVs
-    obs = pd.read_csv(observations_csv, sep=";", dtype=str)
-    fv = pd.read_csv(fieldvisits_csv, sep=";", dtype=str)
-    pr = pd.read_csv(projects_csv, sep=";", dtype=str)
+    obs = read_csv(observations_csv, sep=";")
+    fv = read_csv(fieldvisits_csv, sep=";")
+    pr = read_csv(projects_csv, sep=";")
 
     # Ensure datetime columns are parsed
     fv["Startdatum"] = pd.to_datetime(fv["Startdatum"], errors="coerce")
@@ -419,22 +432,14 @@ def transform_fieldvisits(
 
     # Fill missing coordinates with first non‑NA value
     meta1["Coördinaten"] = meta1["Coördinaten"].str.strip().replace("", np.nan)
-    meta1["coord_project"] = meta1.groupby("project_id")["Coördinaten"].transform(lambda x: x.dropna().iloc[0] if not x.dropna().empty else np.nan)
-    meta1["Coördinaten"] = meta1["Coördinaten"].combine_first(meta1["coord_project"])
-    meta1 = meta1.drop(columns=["coord_project"])
+    coord_project = meta1.groupby("project_id")["Coördinaten"].transform("first")
+    meta1["Coördinaten"] = meta1["Coördinaten"].fillna(coord_project)
 
     # Apply simple removal pattern check directly on the merged data
-    meta2 = meta1.copy()
-    if remove_patterns:
-        pattern = re.compile("|".join(remove_patterns), re.IGNORECASE)
-        meta2["Rows_Removed"] = np.where(
-            meta2["Naam"].fillna("").str.contains(pattern), "remove", "keep"
-        )
-    else:
-        meta2["Rows_Removed"] = "keep"
+    meta1["Rows_Removed"] = _rows_removed(meta1["Naam"], remove_patterns)
 
     # Compute suggested start/end times
-    meta3 = compute_time_suggest(meta2)
+    meta3 = compute_time_suggest(meta1)
     # Flag records requiring manual checks
     meta4 = compute_flag_fieldtime_changes(meta3)
 
@@ -458,9 +463,9 @@ def transform_fieldvisits(
     })
 
     # Write summary CSV
-    os.makedirs(out_dir, exist_ok=True)
+    ensure_dir(out_dir)
     out_path = os.path.join(out_dir, outfile_meta)
-    adjustments.to_csv(out_path, index=False, sep=";", na_rep="")
+    write_csv(adjustments, out_path, sep=";")
     return adjustments
 
 
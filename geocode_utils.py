@@ -1,10 +1,13 @@
 
 from __future__ import annotations
 
+import asyncio
+import importlib.util
 import json
 import os
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 try:
     from geopy.geocoders import Nominatim, ArcGIS
@@ -13,11 +16,205 @@ try:
     _HAS_GEOPY = True
 except Exception:
     _HAS_GEOPY = False
+try:
+    import orjson
+    _HAS_ORJSON = True
+except Exception:
+    _HAS_ORJSON = False
+try:
+    from geopy.adapters import AioHTTPAdapter
+    from geopy.extra.rate_limiter import AsyncRateLimiter
+    _HAS_AIOHTTP = importlib.util.find_spec("aiohttp") is not None
+except Exception:
+    _HAS_AIOHTTP = False
 
 from tqdm import tqdm
 
 
-def reverse_geocode(
+def _json_loads(data: bytes) -> Any:
+    if _HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    if _HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _json_line(obj: Any) -> bytes:
+    if _HAS_ORJSON:
+        return orjson.dumps(obj) + b"\n"
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _journal_path(cache_file: str) -> str:
+    return cache_file + ".jsonl"
+
+
+def _cache_key(lat: Any, lon: Any) -> str:
+    # 5 decimals is ~1 m; re-exports with slightly different float reprs share one entry.
+    # Numeric strings are accepted as before; anything float() rejects raises ValueError.
+    return f"{float(lat):.5f},{float(lon):.5f}"
+
+
+def _migrate_key(key: str) -> str:
+    try:
+        lat, lon = map(float, key.split(","))
+    except ValueError:
+        return key
+    return _cache_key(lat, lon)
+
+
+def _load_cache(cache_file: str) -> Tuple[Dict[str, str], int, int]:
+    ##Snapshot plus journal replay; returns the cache and both entry counts
+
+    cache: Dict[str, str] = {}
+    if os.path.isfile(cache_file):
+        try:
+            with open(cache_file, "rb") as f:
+                cache = _json_loads(f.read())
+        except Exception:
+            cache = {}
+    snapshot_size = len(cache)
+
+    journal_size = 0
+    journal = _journal_path(cache_file)
+    if os.path.isfile(journal):
+        try:
+            with open(journal, "rb") as f:
+                for line in f:
+                    # A line cut short by a crash is skipped
+                    try:
+                        key, addr = _json_loads(line)
+                    except Exception:
+                        continue
+                    cache[key] = addr
+                    journal_size += 1
+        except OSError:
+            pass
+
+    # Caches keyed on full float reprs are re-keyed to the grid in memory only; the file
+    # keeps its keys until the next compaction. Where two old keys land on one grid key,
+    # an entry already on the grid wins, else the first one seen.
+    migrated: Dict[str, str] = {}
+    for key, addr in cache.items():
+        grid_key = _migrate_key(key)
+        if grid_key not in migrated or key == grid_key:
+            migrated[grid_key] = addr
+    return migrated, snapshot_size, journal_size
+
+
+def _open_journal(cache_file: str) -> BinaryIO:
+    path = _journal_path(cache_file)
+    journal = open(path, "ab")
+    # Start on a fresh line if a crash left the last entry unterminated
+    if journal.tell() > 0:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                journal.write(b"\n")
+    return journal
+
+
+def _compact_cache(cache_file: str, cache: Dict[str, str]) -> None:
+    ##Fold the journal into a fresh snapshot, written atomically
+
+    tmp = cache_file + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_json_dumps(cache))
+    os.replace(tmp, cache_file)
+    journal = _journal_path(cache_file)
+    if os.path.isfile(journal):
+        os.remove(journal)
+
+
+def _geocoder_class(geocoder: str):
+    return ArcGIS if geocoder.lower() == "arcgis" else Nominatim
+
+
+def _reverse_serial(
+    points: Dict[str, tuple],
+    geocoder: str,
+    user_agent: str,
+    min_delay_seconds: float,
+    on_result: Optional[Callable[[str, Optional[str]], None]] = None,
+    **geocoder_kwargs: Any,
+) -> Dict[str, Optional[str]]:
+    ##One rate-limited request after another
+
+    geolocator = _geocoder_class(geocoder)(user_agent=user_agent, **geocoder_kwargs)
+    rate_limited = RateLimiter(
+        geolocator.reverse,
+        min_delay_seconds=min_delay_seconds,
+        max_retries=3,
+        error_wait_seconds=3.0,
+    )
+    found: Dict[str, Optional[str]] = {}
+    for key, point in tqdm(points.items(), desc="Reverse geocoding", disable=not points):
+        try:
+            location: Location | None = rate_limited(point, exactly_one=True)  # type: ignore[name-defined]
+            found[key] = location.address if location else None
+        except Exception:
+            found[key] = None
+        if on_result is not None:
+            on_result(key, found[key])
+    return found
+
+
+async def _reverse_async(
+    points: Dict[str, tuple],
+    geocoder: str,
+    user_agent: str,
+    min_delay_seconds: float,
+    workers: int,
+    on_result: Optional[Callable[[str, Optional[str]], None]] = None,
+    **geocoder_kwargs: Any,
+) -> Dict[str, Optional[str]]:
+    ##Up to ``workers`` requests in flight; the limiter still spaces their starts by min_delay_seconds
+
+    semaphore = asyncio.Semaphore(workers)
+    found: Dict[str, Optional[str]] = {}
+    progress = tqdm(total=len(points), desc="Reverse geocoding", disable=not points)
+
+    try:
+        async with _geocoder_class(geocoder)(
+            user_agent=user_agent, adapter_factory=AioHTTPAdapter, **geocoder_kwargs
+        ) as geolocator:
+            rate_limited = AsyncRateLimiter(
+                geolocator.reverse,
+                min_delay_seconds=min_delay_seconds,
+                max_retries=3,
+                error_wait_seconds=3.0,
+            )
+
+            async def _lookup(key: str, point: tuple) -> None:
+                async with semaphore:
+                    try:
+                        location = await rate_limited(point, exactly_one=True)
+                        found[key] = location.address if location else None
+                    except Exception:
+                        found[key] = None
+                if on_result is not None:
+                    on_result(key, found[key])
+                progress.update()
+
+            await asyncio.gather(*(_lookup(key, point) for key, point in points.items()))
+    finally:
+        progress.close()
+    return found
+
+
+def _event_loop_running() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def reverse_geocode_addresses(
     df: pd.DataFrame,
     lat_col: str = "Breedtegraad",
     lon_col: str = "Lengtegraad",
@@ -27,68 +224,115 @@ def reverse_geocode(
     user_agent: str = "observations_geocoder",
     min_delay_seconds: float = 1.1,
     geocoder: str = "nominatim",
+    workers: int = 1,
     **geocoder_kwargs: Any,
-) -> pd.DataFrame:
-
-    df = df.copy()
+) -> List[Optional[str]]:
+    ##Address per row of ``df``, without touching the frame
+    ##``workers`` > 1 opts in to that many concurrent requests (needs aiohttp); the default is one at a time
 
     if not _HAS_GEOPY:
-        df["address"] = None
-        return df
+        return [None] * len(df)
 
-    # Load cache
+    # Load cache: the JSON snapshot plus any entries journaled since
     cache: Dict[str, str] = {}
-    if cache_file and os.path.isfile(cache_file):
-        try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                cache = json.load(f)
-        except Exception:
-            cache = {}
+    snapshot_size = journal_size = 0
+    if cache_file:
+        cache, snapshot_size, journal_size = _load_cache(cache_file)
 
     # Determine which rows to geocode
     mask = df[lat_col].notna() & df[lon_col].notna()
     if behaviours is not None:
         mask &= df[behaviour_col].isin(list(behaviours))
 
-    # Instantiate geocoder
-    if geocoder.lower() == "arcgis":
-        geolocator = ArcGIS(user_agent=user_agent, **geocoder_kwargs)
-    else:
-        geolocator = Nominatim(user_agent=user_agent, **geocoder_kwargs)
-    rate_limited = RateLimiter(
-        geolocator.reverse,
-        min_delay_seconds=min_delay_seconds,
-        max_retries=3,
-        error_wait_seconds=3.0,
-    )
+    # Only the selected rows are scanned, as plain positions and values
+    mask_arr = mask.to_numpy()
+    rows = np.flatnonzero(mask_arr)
+    lats = df[lat_col].to_numpy()[mask_arr].tolist()
+    lons = df[lon_col].to_numpy()[mask_arr].tolist()
 
-    addresses: List[Optional[str]] = [None] * len(df)
-    for idx in tqdm(df.index, desc="Reverse geocoding", disable=(~mask).all()):
-        if not mask.loc[idx]:
+    # Rows sharing a coordinate pair are resolved with a single lookup
+    keys: List[Optional[str]] = [None] * len(df)
+    unique_keys: Dict[str, tuple] = {}
+    for i, lat, lon in zip(rows.tolist(), lats, lons):
+        try:
+            key = _cache_key(lat, lon)
+        except (TypeError, ValueError):
+            # Not a coordinate; the row gets no address, as a failed lookup would
             continue
-        lat = df.at[idx, lat_col]
-        lon = df.at[idx, lon_col]
-        key = f"{lat},{lon}"
-        addr = cache.get(key)
-        if addr is None:
+        keys[i] = key
+        unique_keys.setdefault(key, (round(float(lat), 5), round(float(lon), 5)))
+
+    # Only coordinates missing from the cache go to the geocoder
+    resolved: Dict[str, Optional[str]] = {key: cache.get(key) for key in unique_keys}
+    missing = {key: unique_keys[key] for key, addr in resolved.items() if addr is None}
+    if missing:
+        # New addresses are appended to the journal as they arrive, so a crash keeps them
+        journal: Optional[BinaryIO] = None
+        if cache_file:
             try:
-                location: Location | None = rate_limited((lat, lon), exactly_one=True)  # type: ignore[name-defined]
-                addr = location.address if location else None
-            except Exception:
-                addr = None
-            if addr is not None:
-                cache[key] = addr
-        addresses[idx] = addr
+                journal = _open_journal(cache_file)
+            except OSError:
+                journal = None
 
+        def _record(key: str, addr: Optional[str]) -> None:
+            nonlocal journal, journal_size
+            if addr is None:
+                return
+            cache[key] = addr
+            if journal is not None:
+                try:
+                    journal.write(_json_line([key, addr]))
+                    journal.flush()
+                    journal_size += 1
+                except OSError:
+                    journal = None
 
-    if cache_file:
         try:
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(cache, f, ensure_ascii=False, indent=2)
+            # Concurrent requests need aiohttp and cannot start inside a running event loop
+            if workers > 1 and _HAS_AIOHTTP and not _event_loop_running():
+                found = asyncio.run(_reverse_async(
+                    missing, geocoder, user_agent, min_delay_seconds, workers, _record, **geocoder_kwargs
+                ))
+            else:
+                found = _reverse_serial(
+                    missing, geocoder, user_agent, min_delay_seconds, _record, **geocoder_kwargs
+                )
+        finally:
+            if journal is not None:
+                journal.close()
+        resolved.update(found)
+
+    addresses: List[Optional[str]] = [resolved[k] if k is not None else None for k in keys]
+
+    # Only rewrite the snapshot once the journal outgrows it, so appends stay amortised O(1)
+    if cache_file and journal_size > snapshot_size:
+        try:
+            _compact_cache(cache_file, cache)
         except Exception:
             pass
 
-    df["address"] = addresses
+    return addresses
+
+
+def reverse_geocode(
+    df: pd.DataFrame,
+    lat_col: str = "Breedtegraad",
+    lon_col: str = "Lengtegraad",
+    behaviours: Optional[Iterable[str]] = None,
+    behaviour_col: str = "Gedrag",
+    cache_file: Optional[str] = None,
+    user_agent: str = "observations_geocoder",
+    min_delay_seconds: float = 1.1,
+    geocoder: str = "nominatim",
+    workers: int = 1,
+    **geocoder_kwargs: Any,
+) -> pd.DataFrame:
+
+    df = df.copy()
+    df["address"] = reverse_geocode_addresses(
+        df, lat_col, lon_col, behaviours, behaviour_col, cache_file,
+        user_agent, min_delay_seconds, geocoder, workers, **geocoder_kwargs
+    )
     return df
 
 
@@ -109,3 +353,35 @@ def parse_address(addr: Optional[str]) -> tuple[Optional[str], Optional[str]]:
     if straat and nr:
         adres = f"{straat} {nr}".strip()
     return (adres or None, plaats or None)
+
+
+def parse_address_series(addresses: pd.Series) -> pd.DataFrame:
+    ##Vectorised parse_address over a Series, returning "adres" and "plaats" columns
+
+    n = len(addresses)
+    # One row per non-empty comma-separated part, labelled by row position
+    parts = (
+        pd.Series(addresses.to_numpy(dtype=object), dtype=object)
+        .str.split(",")
+        .explode()
+        .str.strip()
+    )
+    parts = parts[parts.notna() & (parts != "")]
+    row = parts.index.to_numpy()
+    pos = parts.groupby(level=0).cumcount().to_numpy()
+    values = parts.to_numpy(dtype=object)
+    counts = np.bincount(row, minlength=n)
+
+    nr = np.full(n, None, dtype=object)
+    straat = np.full(n, None, dtype=object)
+    plaats = np.full(n, None, dtype=object)
+    nr[row[pos == 0]] = values[pos == 0]
+    straat[row[pos == 1]] = values[pos == 1]
+    plaats_pos = np.where(counts >= 5, counts - 5, counts - 1)
+    at_plaats = pos == plaats_pos[row]
+    plaats[row[at_plaats]] = values[at_plaats]
+
+    has_adres = (nr != None) & (straat != None)  # noqa: E711
+    adres = np.full(n, None, dtype=object)
+    adres[has_adres] = straat[has_adres] + " " + nr[has_adres]
+    return pd.DataFrame({"adres": adres, "plaats": plaats}, index=addresses.index)
@@ -5,27 +5,36 @@ import re
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 import pandas as pd
 import numpy as np
-from geocode_utils import reverse_geocode as geocode_reverse_geocode, parse_address as geocode_parse_address
+from geocode_utils import reverse_geocode as geocode_reverse_geocode, parse_address as geocode_parse_address, parse_address_series
+from geocode_utils import reverse_geocode_addresses
+from fieldvisit_utils import write_csv
 from tqdm import tqdm
 
+_SAFE_NAME_RE = re.compile(r"[^A-Za-z0-9]+")
+_SAFE_NAME_DEDUP_RE = re.compile(r"_+")
+_BAT_RE = re.compile(r"vleermuis|vlieger")
+_OTHER_RE = re.compile(r"\bmuis\b|vos|pad|salamander")
 
 def safe_name(s: str) -> str:
     ##Return a file‑name safe version of ``s``.
     if not isinstance(s, str) or not s:
         return "unknown"
     s = s.strip()
-    s = re.sub(r"[^A-Za-z0-9]+", "_", s)
-    s = re.sub(r"_+", "_", s)
+    s = _SAFE_NAME_RE.sub("_", s)
+    s = _SAFE_NAME_DEDUP_RE.sub("_", s)
     return s.lower()[:40]
 
 
 def assign_groups(df: pd.DataFrame, species_col: str = "Soort") -> pd.DataFrame:
     ##Assign a high‑level group to each observation based on the species
-    df = df.copy()
+    return _assign_groups_inplace(df.copy(), species_col)
+
+
+def _assign_groups_inplace(df: pd.DataFrame, species_col: str = "Soort") -> pd.DataFrame:
     species_lower = df[species_col].fillna("").str.lower()
     conditions = [
-        species_lower.str.contains(r"vleermuis|vlieger", regex=True),
-        species_lower.str.contains(r"\bmuis\b|vos|pad|salamander", regex=True),
+        species_lower.str.contains(_BAT_RE),
+        species_lower.str.contains(_OTHER_RE),
         species_lower == ""
     ]
     choices = ["Vleermuizen", "Overig", "onbekend"]
@@ -35,7 +44,10 @@ def assign_groups(df: pd.DataFrame, species_col: str = "Soort") -> pd.DataFrame:
 
 def fill_missing_counts(df: pd.DataFrame, count_col: str = "Aantal") -> pd.DataFrame:
     #Fill missing observation counts with na
-    df = df.copy()
+    return _fill_missing_counts_inplace(df.copy(), count_col)
+
+
+def _fill_missing_counts_inplace(df: pd.DataFrame, count_col: str = "Aantal") -> pd.DataFrame:
     df[count_col] = df[count_col].fillna(1)
     return df
 
@@ -51,7 +63,14 @@ def assign_functions(df: pd.DataFrame,
                      count_col: str = "Aantal",
                      function_col: str = "Functie") -> pd.DataFrame:
     ##Functional categoies to each observation
-    df = df.copy()
+    return _assign_functions_inplace(df.copy(), group_col, behaviour_col, count_col, function_col)
+
+
+def _assign_functions_inplace(df: pd.DataFrame,
+                              group_col: str = "Groep",
+                              behaviour_col: str = "Gedrag",
+                              count_col: str = "Aantal",
+                              function_col: str = "Functie") -> pd.DataFrame:
 
     # Define behaviour categories
     locatie_verblijf_vleer_VM01 = {
@@ -76,50 +95,42 @@ def assign_functions(df: pd.DataFrame,
     }
     foerageergebied = {"foeragerend"}
 
-    counts = pd.to_numeric(df[count_col], errors="coerce")
+    counts = pd.to_numeric(df[count_col], errors="coerce").to_numpy()
     fun = df.get(function_col, pd.Series([None] * len(df), index=df.index))
-    vleermuizen_mask = df[group_col] == "Vleermuizen"
-    vogels_mask = df[group_col] == "Vogels"
-
-    # Summer and breeding sites for bats (VM01)
-    mask = (
-        vleermuizen_mask &
-        df[behaviour_col].isin(locatie_verblijf_vleer_VM01) &
-        counts.notna() & (counts < 10)
-    )
-    fun.loc[mask] = "zomerverblijfplaats"
+    has_count = ~np.isnan(counts)
+    is_vleer = (df[group_col] == "Vleermuizen").to_numpy()
+    is_vogel = (df[group_col] == "Vogels").to_numpy()
 
-    # Maternity roosts for bats
-    mask = (
-        vleermuizen_mask &
-        df[behaviour_col].isin(locatie_verblijf_vleer_VM01) &
-        counts.notna() & (counts > 9)
-    )
-    fun.loc[mask] = "kraamverblijfplaats"
-
-    # Courtship roosts for bats
-    mask = (
-        vleermuizen_mask &
-        df[behaviour_col].isin(locatie_verblijf_vleer_VM023) &
-        counts.notna()
-    )
-    fun.loc[mask] = "paarverblijfplaats"
+    # Hash the behaviour strings once; set membership is then a lookup on integer codes
+    codes, uniques = pd.factorize(df[behaviour_col])
 
-    # Nesting sites for birds
-    mask = (
-        vogels_mask &
-        df[behaviour_col].isin(locatie_verblijf_vogels) &
-        counts.notna()
-    )
-    fun.loc[mask] = "nestlocatie"
+    def _behaviour_in(values: set) -> np.ndarray:
+        # Code -1 (missing) picks the trailing False
+        return np.append(pd.Index(uniques).isin(values), False)[codes]
 
-    # Flight paths
-    mask = df[behaviour_col].isin(vliegroute) & counts.notna()
-    fun.loc[mask] = "vliegroute"
+    vleer_vm01 = is_vleer & _behaviour_in(locatie_verblijf_vleer_VM01) & has_count
 
-    # Foraging areas
-    mask = df[behaviour_col].isin(foerageergebied) & counts.notna()
-    fun.loc[mask] = "foerageergebied"
+    # Later categories take precedence, so they come first here
+    conditions = [
+        # Foraging areas
+        _behaviour_in(foerageergebied) & has_count,
+        # Flight paths
+        _behaviour_in(vliegroute) & has_count,
+        # Nesting sites for birds
+        is_vogel & _behaviour_in(locatie_verblijf_vogels) & has_count,
+        # Courtship roosts for bats
+        is_vleer & _behaviour_in(locatie_verblijf_vleer_VM023) & has_count,
+        # Maternity roosts for bats
+        vleer_vm01 & (counts > 9),
+        # Summer and breeding sites for bats (VM01)
+        vleer_vm01 & (counts < 10),
+    ]
+    choices = [
+        "foerageergebied", "vliegroute", "nestlocatie",
+        "paarverblijfplaats", "kraamverblijfplaats", "zomerverblijfplaats",
+    ]
+    matched = np.logical_or.reduce(conditions)
+    fun = fun.mask(matched, np.select(conditions, choices, default=None))
 
     df[function_col] = fun
     return df
@@ -137,8 +148,9 @@ def transform_data(raw_df: pd.DataFrame,
     df = raw_df.copy()
 
     if "Gezien op" in df.columns:
-        df["Datum"] = pd.to_datetime(df["Gezien op"], errors="coerce").dt.date
-        df["Tijd"] = pd.to_datetime(df["Gezien op"], errors="coerce").dt.time
+        gezien_op = pd.to_datetime(df["Gezien op"], errors="coerce")
+        df["Datum"] = gezien_op.dt.date
+        df["Tijd"] = gezien_op.dt.time
     else:
         df["Datum"] = pd.NaT
         df["Tijd"] = pd.NaT
@@ -153,31 +165,36 @@ def transform_data(raw_df: pd.DataFrame,
     else:
         df["Locatie_adres"] = None
 
-    df = assign_groups(df)
+    # df is already this function's own copy, so the steps below fill it in place
+    _assign_groups_inplace(df)
 
-    df = fill_missing_counts(df)
+    _fill_missing_counts_inplace(df)
 
     # Reverse geocode
     if behaviours_for_geocoding is not None:
-        df = reverse_geocode(df,
-                             lat_col="Breedtegraad",
-                             lon_col="Lengtegraad",
-                             behaviours=behaviours_for_geocoding,
-                             behaviour_col="Gedrag",
-                             cache_file=geocode_cache)
+        df["address"] = reverse_geocode_addresses(df,
+                                                   lat_col="Breedtegraad",
+                                                   lon_col="Lengtegraad",
+                                                   behaviours=behaviours_for_geocoding,
+                                                   behaviour_col="Gedrag",
+                                                   cache_file=geocode_cache)
     else:
         df["address"] = None
 
-    df = assign_functions(df)
+    _assign_functions_inplace(df)
 
     # Assign ID per address
     codes, uniques = pd.factorize(df["address"], sort=True)
     df["Verblijfnummer"] = codes.astype(float) + 1
     df.loc[df["address"].isna(), "Verblijfnummer"] = np.nan
 
-    parsed = df["address"].apply(lambda s: parse_address(s))
-    df["Adres"] = parsed.apply(lambda t: t[0])
-    df["Plaats"] = parsed.apply(lambda t: t[1])
+    # Parse each distinct address once; missing addresses (code -1) stay None
+    parsed = parse_address_series(pd.Series(uniques, dtype=object))
+    has_address = codes >= 0
+    for src, dst in (("adres", "Adres"), ("plaats", "Plaats")):
+        values = np.full(len(df), None, dtype=object)
+        values[has_address] = parsed[src].to_numpy()[codes[has_address]]
+        df[dst] = values
 
     return df
 
@@ -195,11 +212,12 @@ def clean_data(df: pd.DataFrame,
     ]
     existing_cols = [c for c in cols if c in df.columns]
 
-    # Group by project and write each to CSV
-    for project, group in df.dropna(subset=[project_col]).groupby(project_col):
+    # Group by project and write each to CSV (Arrow writer when pyarrow is installed)
+    # Rows without a project are dropped by the groupby itself; output order is irrelevant
+    for project, group in df.groupby(project_col, sort=False, observed=True, dropna=True):
         fname = f"waarnemingen_export_{safe_name(str(project))}.csv"
         out_path = os.path.join(out_dir, fname)
-        group[existing_cols].to_csv(out_path, sep=";", index=False, na_rep="")
+        write_csv(group[existing_cols], out_path, sep=";")
 
 
 if __name__ == "__main__":
@@ -1,12 +1,117 @@
 from __future__ import annotations
+import multiprocessing as mp
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
 from typing import Optional
 import pandas as pd
 import geopandas as gpd
-from shapely.geometry import Point
 import folium
+from pyproj import Transformer
 from observations_processing import safe_name
+from fieldvisit_utils import read_csv
+
+# WGS84 lon/lat to Dutch RD New, built once and shared by every project
+_TO_RD = Transformer.from_crs("EPSG:4326", "EPSG:28992", always_xy=True)
+
+
+def _emit_project(project: str,
+                  group: pd.DataFrame,
+                  out_root: str,
+                  lat_col: str,
+                  lon_col: str,
+                  popup_cols: Optional[list[str]] = None) -> None:
+    ##GeoPackage, shapefile and map for one project
+    proj_name = safe_name(str(project))
+    proj_dir = os.path.join(out_root, f"waarn_{proj_name}")
+    os.makedirs(proj_dir, exist_ok=True)
+
+    # Project the coordinate arrays straight to RD; no intermediate WGS84 frame
+    x, y = _TO_RD.transform(group[lon_col].to_numpy(), group[lat_col].to_numpy())
+    gdf_rd = gpd.GeoDataFrame(
+        group,
+        geometry=gpd.points_from_xy(x, y, crs="EPSG:28992"),
+        crs="EPSG:28992"
+    )
+
+    # Prepare shapefile safe copy
+    shp_ready = gdf_rd.copy()
+    for col in shp_ready.columns:
+        if pd.api.types.is_datetime64_any_dtype(shp_ready[col]):
+            shp_ready[col] = shp_ready[col].dt.strftime("%Y-%m-%d %H:%M:%S")
+        elif pd.api.types.is_timedelta64_dtype(shp_ready[col]):
+            shp_ready[col] = shp_ready[col].astype(str)
+
+    #GeoPackage
+    gpkg_path = os.path.join(proj_dir, f"waarn_{proj_name}.gpkg")
+    gdf_rd.to_file(gpkg_path, layer=proj_name, driver="GPKG")
+
+    #Shapefile
+    shp_path = os.path.join(proj_dir, f"waarn_{proj_name}.shp")
+    shp_ready.to_file(shp_path, driver="ESRI Shapefile")
+
+    #Interactive map using folium
+    if popup_cols is None:
+        popup_cols_to_use = [
+            c for c in ["Soort", "Adres", "Plaats", "Datum"] if c in group.columns
+        ]
+    else:
+        popup_cols_to_use = popup_cols
+
+    #Folium map centred on the mean coordinate
+    mean_lat = group[lat_col].mean()
+    mean_lon = group[lon_col].mean()
+    m = folium.Map(location=[mean_lat, mean_lon], zoom_start=13)
+
+    # Popup text per row: "<b>col:</b> value" for each present value, joined by <br>
+    popup = pd.Series("", index=group.index)
+    for col in popup_cols_to_use:
+        piece = ("<b>" + col + ":</b> " + group[col].astype(str)).where(group[col].notna())
+        joined = popup.where(popup == "", popup + "<br>") + piece
+        popup = joined.where(piece.notna(), popup)
+
+    # One GeoJSON layer for all markers instead of a CircleMarker per row
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {"popup": text},
+        }
+        for lat, lon, text in zip(
+            group[lat_col].tolist(), group[lon_col].tolist(), popup.tolist()
+        )
+    ]
+    folium.GeoJson(
+        {"type": "FeatureCollection", "features": features},
+        marker=folium.CircleMarker(radius=5, weight=1, fill=True, fill_opacity=0.8),
+        popup=folium.GeoJsonPopup(fields=["popup"], labels=False),
+    ).add_to(m)
+
+    if len(group) > 1:
+        bounds = [[group[lat_col].min(), group[lon_col].min()],
+                  [group[lat_col].max(), group[lon_col].max()]]
+        m.fit_bounds(bounds)
+
+    # Save as HTML
+    html_path = os.path.join(proj_dir, f"map_{proj_name}.html")
+    m.save(html_path)
+
+
+def _start_pool(n_workers: int) -> Optional[ProcessPoolExecutor]:
+    # Pool with a worker known to start, or None when processes are unavailable (e.g. restricted sandbox).
+    # Spawned, not forked: the CSV was read with PyArrow, whose thread pool is already running.
+    try:
+        pool = ProcessPoolExecutor(max_workers=n_workers, mp_context=mp.get_context("spawn"))
+    except OSError:
+        return None
+    try:
+        pool.submit(int).result()
+    except (OSError, BrokenProcessPool):
+        pool.shutdown(cancel_futures=True)
+        return None
+    return pool
 
 
 def create_gis_outputs(csv_path: str,
@@ -33,8 +138,8 @@ def create_gis_outputs(csv_path: str,
             )
         return
 
-    # Load the data
-    df = pd.read_csv(csv_path, sep=";", dtype=str)
+    # Load the data as text; the coordinate columns are made numeric below
+    df = read_csv(csv_path, sep=";")
     if project_col not in df.columns:
         candidates = [
             c for c in df.columns
@@ -90,71 +195,22 @@ def create_gis_outputs(csv_path: str,
     # Create output directory
     os.makedirs(out_root, exist_ok=True)
 
-    # Iterate per project
-    for project, group in df.groupby(project_col):
-        proj_name = safe_name(str(project))
-        proj_dir = os.path.join(out_root, f"waarn_{proj_name}")
-        os.makedirs(proj_dir, exist_ok=True)
-
-
-        gdf_wgs = gpd.GeoDataFrame(
-            group,
-            geometry=[Point(xy) for xy in zip(group[lon_col], group[lat_col])],
-            crs="EPSG:4326"
-        )
-
-        gdf_rd = gdf_wgs.to_crs("EPSG:28992")
-
-        # Prepare shapefile safe copy
-        shp_ready = gdf_rd.copy()
-        for col in shp_ready.columns:
-            if pd.api.types.is_datetime64_any_dtype(shp_ready[col]):
-                shp_ready[col] = shp_ready[col].dt.strftime("%Y-%m-%d %H:%M:%S")
-            elif pd.api.types.is_timedelta64_dtype(shp_ready[col]):
-                shp_ready[col] = shp_ready[col].astype(str)
-
-        #GeoPackage
-        gpkg_path = os.path.join(proj_dir, f"waarn_{proj_name}.gpkg")
-        gdf_rd.to_file(gpkg_path, layer=proj_name, driver="GPKG")
-
-        #Shapefile
-        shp_path = os.path.join(proj_dir, f"waarn_{proj_name}.shp")
-        shp_ready.to_file(shp_path, driver="ESRI Shapefile")
-
-        #Interactive map using folium
-        if popup_cols is None:
-            popup_cols_to_use = [
-                c for c in ["Soort", "Adres", "Plaats", "Datum"] if c in group.columns
-            ]
-        else:
-            popup_cols_to_use = popup_cols
-
-        #Folium map centred on the mean coordinate
-        mean_lat = group[lat_col].mean()
-        mean_lon = group[lon_col].mean()
-        m = folium.Map(location=[mean_lat, mean_lon], zoom_start=13)
-
-        for _, row in group.iterrows():
-            popup_html = "<br>".join([
-                f"<b>{col}:</b> {row[col]}" for col in popup_cols_to_use if pd.notna(row[col])
-            ])
-            folium.CircleMarker(
-                location=(row[lat_col], row[lon_col]),
-                radius=5,
-                weight=1,
-                fill=True,
-                fill_opacity=0.8,
-                popup=popup_html
-            ).add_to(m)
-
-        if len(group) > 1:
-            bounds = [[group[lat_col].min(), group[lon_col].min()],
-                      [group[lat_col].max(), group[lon_col].max()]]
-            m.fit_bounds(bounds)
-
-        # Save as HTML
-        html_path = os.path.join(proj_dir, f"map_{proj_name}.html")
-        m.save(html_path)
+    # Projects are independent; spread them over processes when there is more than one
+    groups = list(df.groupby(project_col, sort=False, observed=True))
+    n_workers = min(os.cpu_count() or 1, len(groups))
+    pool = _start_pool(n_workers) if n_workers > 1 else None
+    if pool is not None:
+        # Errors from a project propagate; outputs are never rewritten by a serial rerun
+        with pool:
+            list(pool.map(
+                _emit_project,
+                [project for project, _ in groups],
+                [group for _, group in groups],
+                repeat(out_root), repeat(lat_col), repeat(lon_col), repeat(popup_cols),
+            ))
+        return
+    for project, group in groups:
+        _emit_project(project, group, out_root, lat_col, lon_col, popup_cols)
 
 
 if __name__ == "__main__":
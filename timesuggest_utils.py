@@ -2,202 +2,312 @@
 from __future__ import annotations
 
 import re
-from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+from datetime import timezone
+from typing import Any, Callable, Iterable, Tuple
 
 import numpy as np
 import pandas as pd
 
 try:
-    from .fieldvisit_utils import parse_local, to_local
+    from .fieldvisit_utils import TIMEZONE, parse_local, to_local
 except Exception:
-    from fieldvisit_utils import parse_local, to_local
+    from fieldvisit_utils import TIMEZONE, parse_local, to_local
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    _HAS_PYARROW = True
+except Exception:
+    _HAS_PYARROW = False
+
+try:
+    import polars as pl
+    _HAS_POLARS = True
+except Exception:
+    _HAS_POLARS = False
+
+_PROJECT_RE = re.compile(r"([vzwh]m[- ]?\d+|gz|zr|hm|uitvliegtelling)", re.IGNORECASE)
+_VM_SINGLE_RE = re.compile(r"VM(\d)$", re.IGNORECASE)
+_DAYPART_RE = re.compile(r"\b(avond|ochtend)\s*([0-9]+|I{1,3})?", re.IGNORECASE)
+_VM01_RE = re.compile(r"VM01", re.IGNORECASE)
+_VM02_RE = re.compile(r"VM02", re.IGNORECASE)
+_GZ_RE = re.compile(r"GZ", re.IGNORECASE)
+_ZR_RE = re.compile(r"ZR", re.IGNORECASE)
+_BLANK_RE = re.compile(r"\s*")
+
+_UTC = timezone.utc
+_HOUR = np.timedelta64(1, "h")
+_MINUTE = np.timedelta64(1, "m")
+_CHECK_LEVELS = ["no", "yes"]
+_NAT_NS = np.iinfo(np.int64).min
 
-def _extract_project_and_daypart(name: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+def _extract_project_and_daypart(names: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    ##Project code and day part per name; None where a name has neither
 
-    if not isinstance(name, str) or not name:
-        return (None, None)
-    name_lower = name.lower()
+    name_lower = pd.Series(names.to_numpy(dtype=object), dtype=object).str.lower()
     # Extract project code
-    match = re.search(r"([vzwh]m[- ]?\d+|gz|zr|hm|uitvliegtelling)", name_lower, re.IGNORECASE)
-    project = None
-    if match:
-        project = match.group(1).upper().replace(" ", "").replace("-", "")
-        # normalise VM single digit codes to have a leading zero
-        m2 = re.match(r"VM(\d)$", project, re.IGNORECASE)
-        if m2:
-            project = f"VM0{m2.group(1)}"
-        if project.startswith("WM"):
-            project = project.replace("WM", "VM", 1)
+    project = (
+        name_lower.str.extract(_PROJECT_RE, expand=False)
+        .str.upper()
+        .str.replace(" ", "", regex=False)
+        .str.replace("-", "", regex=False)
+    )
+    # normalise VM single digit codes to have a leading zero
+    project = project.str.replace(_VM_SINGLE_RE, r"VM0\1", regex=True)
+    project = project.str.replace(r"^WM", "VM", regex=True)
     # Extract day part thingy
-    dagdeel_match = re.search(r"\b(avond|ochtend)\s*([0-9]+|I{1,3})?", name_lower, re.IGNORECASE)
-    dagdeel = None
-    if dagdeel_match:
-        t = dagdeel_match.group(1).lower()
-        n_raw = dagdeel_match.group(2)
-        # normalise numerals
-        n_norm = None
-        if n_raw:
-            roman_map = {"i": "1", "ii": "2", "iii": "3"}
-            lower = n_raw.lower()
-            if lower in roman_map:
-                n_norm = roman_map[lower]
-            else:
-                try:
-                    n_norm = str(int(n_raw))
-                except ValueError:
-                    n_norm = None
-        if n_norm:
-            dagdeel = f"{t} {n_norm}"
-        else:
-            dagdeel = t
-    return (project, dagdeel)
+    parts = name_lower.str.extract(_DAYPART_RE)
+    t, n_raw = parts[0], parts[1]
+    # normalise numerals; int() drops leading zeros but keeps a lone "0"
+    n_norm = n_raw.map({"i": "1", "ii": "2", "iii": "3"})
+    n_norm = n_norm.fillna(n_raw.str.lstrip("0").replace("", "0"))
+    dagdeel = t.where(n_norm.isna(), t + " " + n_norm)
+
+    def _nullable(values: pd.Series) -> pd.Series:
+        return values.astype(object).where(values.notna(), None)
+
+    return _nullable(project), _nullable(dagdeel)
+
+
+def _parsed(s: pd.Series, utc: bool) -> pd.Series | None:
+    # One to_datetime call for datetime columns and ISO strings; None where the
+    # column holds Python objects that need the scalar converter
+    if pd.api.types.is_datetime64_any_dtype(s.dtype):
+        return pd.to_datetime(s, utc=utc)
+    if s.dtype != object or pd.api.types.infer_dtype(s, skipna=True) not in ("string", "empty"):
+        return None
+    try:
+        values = pd.to_datetime(s, errors="coerce", utc=utc, format="ISO8601")
+    except (TypeError, ValueError):
+        return None
+    return values if pd.api.types.is_datetime64_any_dtype(values) else None
+
+
+def _per_value(s: pd.Series, convert) -> pd.Series:
+    return pd.to_datetime(s.apply(convert), utc=True).dt.tz_convert(TIMEZONE)
+
+
+def _with_fallback(values: pd.Series, s: pd.Series, convert) -> pd.Series:
+    # Strings the ISO parse left as NaT get the scalar converter's own format inference
+    retry = values.isna().to_numpy() & s.notna().to_numpy()
+    if retry.any():
+        values = values.copy()
+        values[retry] = _per_value(s[retry], convert)
+    return values
+
+
+def _parse_local_series(s: pd.Series) -> pd.Series:
+    ##Column-wise parse_local: naive values are local clock time, aware values are converted
+    values = _parsed(s, utc=False)
+    if values is None:
+        return _per_value(s, parse_local)
+    if values.dt.tz is not None:
+        values = values.dt.tz_convert(TIMEZONE)
+    else:
+        # Ambiguous/nonexistent clock times resolve as datetime's fold=0 does
+        values = values.dt.tz_localize(
+            TIMEZONE, ambiguous=np.ones(len(values), dtype=bool), nonexistent=pd.Timedelta(hours=1)
+        )
+    return _with_fallback(values, s, parse_local)
+
+
+def _to_local_series(s: pd.Series) -> pd.Series:
+    ##Column-wise to_local: naive values are UTC
+    values = _parsed(s, utc=True)
+    if values is None:
+        return _per_value(s, to_local)
+    return _with_fallback(values.dt.tz_convert(TIMEZONE), s, to_local)
+
+
+def _utc_values(s: pd.Series) -> np.ndarray:
+    return pd.to_datetime(s, utc=True).dt.tz_localize(None).to_numpy(dtype="datetime64[ns]")
+
+
+def _local_series(values: np.ndarray, index: pd.Index) -> pd.Series:
+    return pd.Series(pd.to_datetime(values).tz_localize(_UTC), index=index).dt.tz_convert(TIMEZONE)
+
+
+def _at_time(s: pd.Series, hour: int, minute: int) -> pd.Series:
+    # Timestamp.replace(hour, minute, second=0) per value: ambiguous times keep summer
+    # time and times in the spring gap land on the same instant an hour later
+    wall = s.dt.tz_localize(None)
+    wall = wall.dt.normalize() + pd.Timedelta(hours=hour, minutes=minute) + (wall - wall.dt.floor("s"))
+    return wall.dt.tz_localize(
+        TIMEZONE, ambiguous=np.ones(len(s), dtype=bool), nonexistent=pd.Timedelta(hours=1)
+    )
+
+
+def _nat_ns(s: pd.Series) -> np.ndarray:
+    # Datetime columns are read as their int64 values; elsewhere only missingness matters
+    if pd.api.types.is_datetime64_any_dtype(s.dtype):
+        return s.array.asi8
+    return np.where(s.isna().to_numpy(), _NAT_NS, 0)
+
+
+def _arrow_text(s: pd.Series) -> Any:
+    # UTF-8 Arrow array for a column of str/None; None when some value is not text
+    if not _HAS_PYARROW:
+        return None
+    try:
+        return pa.array(s, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, UnicodeEncodeError):
+        return None
+
+
+def _name_empty(names: pd.Series) -> np.ndarray:
+    ##Missing or whitespace-only names
+    # Tested in place; no stripped copy of each name is built
+    text = _arrow_text(names)
+    if text is None:
+        return names.isna().to_numpy() | names.str.fullmatch(_BLANK_RE, na=False).to_numpy(dtype=bool)
+    empty = pc.or_(pc.equal(pc.utf8_length(text), 0), pc.utf8_is_space(text))
+    return pc.fill_null(empty, True).to_numpy(zero_copy_only=False)
+
+
+def _is_vm03(projects: pd.Series) -> np.ndarray:
+    ##Project codes starting with VM03, any case
+    text = _arrow_text(projects)
+    if text is None:
+        return projects.str.upper().str.startswith("VM03", na=False).to_numpy(dtype=bool)
+    return pc.fill_null(pc.starts_with(pc.utf8_upper(text), "VM03"), False).to_numpy(zero_copy_only=False)
 
 
 def get_fieldvisit_time_suggest(df: pd.DataFrame) -> pd.DataFrame:
 
-    df = df.copy()
+    df = df.copy(deep=False)
     # Parse local datetimes
-    df["Starttijd_Suggest"] = df.get("Startdatum").apply(parse_local)
-    df["Eindtijd_Suggest"] = df.get("Einddatum").apply(parse_local)
-    df["sunrise_local"] = df.get("sunrise").apply(lambda x: to_local(x) if not pd.isna(x) else None)
-    df["sunset_local"] = df.get("sunset").apply(lambda x: to_local(x) if not pd.isna(x) else None)
-
-    projects: List[Optional[str]] = []
-    dagdelen: List[Optional[str]] = []
-    # Precompute project/daypart for each row from the name
+    df["Starttijd_Suggest"] = _parse_local_series(df.get("Startdatum"))
+    df["Eindtijd_Suggest"] = _parse_local_series(df.get("Einddatum"))
+    df["sunrise_local"] = _to_local_series(df.get("sunrise"))
+    df["sunset_local"] = _to_local_series(df.get("sunset"))
+
+    # Project/daypart for each row from the name
     names = df.get("Naam", pd.Series([None] * len(df)))
-    for name in names:
-        project, dagdeel = _extract_project_and_daypart(name)
-        projects.append(project)
-        dagdelen.append(dagdeel)
-    df["Project"] = projects
-    df["Dagdeel"] = dagdelen
-
-    # Containers for results
-    results_start: List[Optional[datetime]] = []
-    results_end: List[Optional[datetime]] = []
-    results_dur: List[Optional[float]] = []
-
-    # Iterate rows and apply adjustment logic
-    for _, row in df.iterrows():
-        proj: str = row.get("Project") or ""
-        dagdeel: str = row.get("Dagdeel") or ""
-        start: Optional[datetime] = row.get("Starttijd_Suggest")
-        end: Optional[datetime] = row.get("Eindtijd_Suggest")
-        sunrise_local: Optional[datetime] = row.get("sunrise_local")
-        sunset_local: Optional[datetime] = row.get("sunset_local")
-
-
-        def update_time(dt: datetime, hour: int, minute: int, second: int = 0) -> datetime:
-            return dt.replace(hour=hour, minute=minute, second=second)
-
-        # Evening adjustments for VM01
-        if re.fullmatch(r"VM01", proj, flags=re.IGNORECASE) and dagdeel.startswith("avond"):
-            if start and sunset_local:
-                if start > sunset_local or start < sunset_local - timedelta(hours=1):
-                    start = sunset_local
-            if end and sunset_local:
-                three_h = sunset_local + timedelta(hours=3)
-                four_h = sunset_local + timedelta(hours=4)
-                if end < three_h or end > four_h:
-                    end = three_h
-        # Morning adjustments for VM01
-        if re.fullmatch(r"VM01", proj, flags=re.IGNORECASE) and dagdeel.startswith("ochtend"):
-            if end and sunrise_local:
-                start_of_window = sunrise_local
-                end_of_window = sunrise_local + timedelta(hours=4)
-                if end < start_of_window or end > end_of_window:
-                    end = start_of_window
-            if start and sunrise_local:
-                start_window = sunrise_local - timedelta(hours=4)
-                end_window = sunrise_local - timedelta(hours=3)
-                if start < start_window or start > end_window:
-                    start = sunrise_local - timedelta(hours=3)
-        # VM02 evening rules
-        if re.fullmatch(r"VM02", proj, flags=re.IGNORECASE) and dagdeel.startswith("avond"):
-            if start:
-                start_min = start.hour * 60 + start.minute
-                lower = 22 * 60 + 59
-                upper = 23 * 60 + 59
-                if start_min < lower or start_min > upper:
-                    start = update_time(start, 23, 59, 0)
-            if start and end and end <= start:
-                end = end + timedelta(days=1)
-            if end:
-                end_min = end.hour * 60 + end.minute
-                if end_min < 2 * 60:
-                    end = update_time(end, 2, 0, 0)
-                elif end_min > 3 * 60:
-                    end = update_time(end, 3, 0, 0)
-        # GZ projects: evening relative to sunset
-        if re.search(r"GZ", proj, flags=re.IGNORECASE):
-            if start and sunset_local:
-                lower = sunset_local - timedelta(minutes=150)
-                upper = sunset_local - timedelta(minutes=90)
-                if start > upper or start < lower:
-                    start = sunset_local - timedelta(minutes=90)
-            if end and sunset_local:
-                lower = sunset_local + timedelta(minutes=30)
-                upper = sunset_local + timedelta(minutes=90)
-                if end < lower or end > upper:
-                    end = sunset_local + timedelta(minutes=30)
-        # ZR projects: morning relative to sunrise
-        if re.search(r"ZR", proj, flags=re.IGNORECASE):
-            if start and sunrise_local:
-                lower = sunrise_local - timedelta(minutes=150)
-                upper = sunrise_local - timedelta(minutes=90)
-                if start > upper or start < lower:
-                    start = sunrise_local - timedelta(minutes=90)
-            if end and sunrise_local:
-                lower = sunrise_local + timedelta(minutes=30)
-                upper = sunrise_local + timedelta(minutes=90)
-                if end < lower or end > upper:
-                    end = sunrise_local + timedelta(minutes=30)
-        # Compute duration in hours if both times present
-        duration: Optional[float]
-        if start and end:
-            duration = (end - start).total_seconds() / 3600.0
-        else:
-            duration = np.nan
-        results_start.append(start)
-        results_end.append(end)
-        results_dur.append(duration)
-
-    df["Starttijd_Suggest"] = results_start
-    df["Eindtijd_Suggest"] = results_end
-    df["duur_suggest"] = results_dur
+    projects, dagdelen = _extract_project_and_daypart(names)
+    df["Project"] = projects.to_numpy()
+    df["Dagdeel"] = dagdelen.to_numpy()
+
+    # Rule masks; a row matches at most one of VM01, VM02, GZ and ZR
+    proj = df["Project"].fillna("")
+    dagdeel = df["Dagdeel"].fillna("")
+    avond = dagdeel.str.startswith("avond").to_numpy(dtype=bool)
+    ochtend = dagdeel.str.startswith("ochtend").to_numpy(dtype=bool)
+    is_vm01 = proj.str.fullmatch(_VM01_RE).to_numpy(dtype=bool)
+    is_vm02 = proj.str.fullmatch(_VM02_RE).to_numpy(dtype=bool)
+    is_gz = proj.str.contains(_GZ_RE).to_numpy(dtype=bool)
+    is_zr = proj.str.contains(_ZR_RE).to_numpy(dtype=bool)
+
+    # UTC datetime64 arrays; comparisons involving NaT are False, so missing values never move
+    start = _utc_values(df["Starttijd_Suggest"])
+    end = _utc_values(df["Eindtijd_Suggest"])
+    sunrise = _utc_values(df["sunrise_local"])
+    sunset = _utc_values(df["sunset_local"])
+
+    # Evening adjustments for VM01
+    m = is_vm01 & avond
+    start = np.where(m & ((start > sunset) | (start < sunset - _HOUR)), sunset, start)
+    end = np.where(m & ((end < sunset + 3 * _HOUR) | (end > sunset + 4 * _HOUR)), sunset + 3 * _HOUR, end)
+    # Morning adjustments for VM01
+    m = is_vm01 & ochtend
+    end = np.where(m & ((end < sunrise) | (end > sunrise + 4 * _HOUR)), sunrise, end)
+    start = np.where(
+        m & ((start < sunrise - 4 * _HOUR) | (start > sunrise - 3 * _HOUR)), sunrise - 3 * _HOUR, start
+    )
+    # GZ projects: evening relative to sunset
+    start = np.where(
+        is_gz & ((start > sunset - 90 * _MINUTE) | (start < sunset - 150 * _MINUTE)),
+        sunset - 90 * _MINUTE,
+        start,
+    )
+    end = np.where(
+        is_gz & ((end < sunset + 30 * _MINUTE) | (end > sunset + 90 * _MINUTE)), sunset + 30 * _MINUTE, end
+    )
+    # ZR projects: morning relative to sunrise
+    start = np.where(
+        is_zr & ((start > sunrise - 90 * _MINUTE) | (start < sunrise - 150 * _MINUTE)),
+        sunrise - 90 * _MINUTE,
+        start,
+    )
+    end = np.where(
+        is_zr & ((end < sunrise + 30 * _MINUTE) | (end > sunrise + 90 * _MINUTE)), sunrise + 30 * _MINUTE, end
+    )
+
+    start = _local_series(start, df.index)
+    end = _local_series(end, df.index)
+
+    # VM02 evening rules work on local clock time
+    m = pd.Series(is_vm02 & avond, index=df.index)
+    start_min = start.dt.hour * 60 + start.dt.minute
+    start = start.mask(m & ((start_min < 22 * 60 + 59) | (start_min > 23 * 60 + 59)), _at_time(start, 23, 59))
+    end = end.mask(m & (end <= start), end + pd.Timedelta(days=1))
+    end_min = end.dt.hour * 60 + end.dt.minute
+    end = end.mask(m & (end_min < 2 * 60), _at_time(end, 2, 0))
+    end = end.mask(m & (end_min > 3 * 60), _at_time(end, 3, 0))
+
+    df["Starttijd_Suggest"] = start
+    df["Eindtijd_Suggest"] = end
+    df["duur_suggest"] = (end - start).dt.total_seconds() / 3600.0
 
     return df
 
 
-def flag_fieldtime_changes(df: pd.DataFrame) -> pd.DataFrame:
+def prepare_check_data(columns: Iterable) -> Callable[[pd.DataFrame], pd.DataFrame]:
+    ##flag_fieldtime_changes specialised for frames with ``columns``; build it once and reuse it in loops
+    columns = set(columns)
 
-    df = df.copy()
     # Determine which name column to inspect for emptiness
-    if "Naam_schoon" in df.columns:
-        name_col_to_check = "Naam_schoon"
-    elif "Naam" in df.columns:
-        name_col_to_check = "Naam"
+    if "Naam_schoon" in columns:
+        name_col = "Naam_schoon"
+    elif "Naam" in columns:
+        name_col = "Naam"
     else:
-        # If neither column exists, create an empty string
-        df["_tmp_name"] = ""
-        name_col_to_check = "_tmp_name"
+        name_col = None
+    has_project = "Project" in columns
 
-    name_series = df[name_col_to_check].fillna("")
-    naam_missing = name_series.str.strip() == ""
+    def _flag(df: pd.DataFrame) -> pd.DataFrame:
+        # The string tests run as Arrow kernels; a missing name column means every name is empty
+        n = len(df)
+        naam_missing = _name_empty(df[name_col]) if name_col is not None else np.ones(n, dtype=bool)
+        vm03_mask = _is_vm03(df["Project"]) if has_project else np.zeros(n, dtype=bool)
+        # Sun times are int64 with NaT as _NAT_NS
+        sunrise = _nat_ns(df.get("sunrise"))
+        sunset = _nat_ns(df.get("sunset"))
+        check_mask = vm03_mask | naam_missing | (sunrise == _NAT_NS) | (sunset == _NAT_NS)
+        # Only check_data is added, so a shallow copy keeps the caller's frame intact
+        # (assign would deep-copy every column without copy-on-write)
+        df = df.copy(deep=False)
+        # Two-level categorical over the mask bytes themselves (no copy); reads and writes as "yes"/"no"
+        df["check_data"] = pd.Categorical.from_codes(check_mask.view(np.int8), categories=_CHECK_LEVELS)
+        return df
 
-    # Check project codes if present
-    proj_series = df.get("Project", pd.Series([""] * len(df)))
-    vm03_mask = proj_series.fillna("").str.contains(r"^VM03", case=False, regex=True)
-    sunrise_missing = df.get("sunrise").isna()
-    sunset_missing = df.get("sunset").isna()
+    return _flag
 
-    check_mask = vm03_mask | sunrise_missing | sunset_missing | naam_missing
-    df["check_data"] = np.where(check_mask, "yes", "no")
 
-    # Clean up temporary column if created
-    if "_tmp_name" in df.columns:
-        df = df.drop(columns=["_tmp_name"])
-    return df
+def _flag_fieldtime_changes_polars(lf: Any) -> Any:
+    ##flag_fieldtime_changes for a Polars (Lazy)Frame; Polars fuses and parallelises the checks
+    names = lf.collect_schema().names() if isinstance(lf, pl.LazyFrame) else lf.columns
+
+    name_col = "Naam_schoon" if "Naam_schoon" in names else ("Naam" if "Naam" in names else None)
+    if name_col is not None:
+        name = pl.col(name_col).cast(pl.Utf8)
+        naam_missing = name.is_null() | (name.str.strip_chars() == "")
+    else:
+        naam_missing = pl.lit(True)
+    if "Project" in names:
+        vm03 = pl.col("Project").cast(pl.Utf8).str.to_uppercase().str.starts_with("VM03").fill_null(False)
+    else:
+        vm03 = pl.lit(False)
+
+    check = vm03 | pl.col("sunrise").is_null() | pl.col("sunset").is_null() | naam_missing
+    return lf.with_columns(
+        check_data=pl.when(check).then(pl.lit("yes")).otherwise(pl.lit("no")).cast(pl.Enum(_CHECK_LEVELS))
+    )
+
+
+def flag_fieldtime_changes(df: pd.DataFrame) -> pd.DataFrame:
+
+    # Polars input stays in Polars
+    if _HAS_POLARS and isinstance(df, (pl.LazyFrame, pl.DataFrame)):
+        return _flag_fieldtime_changes_polars(df)
+
+    return prepare_check_data(df.columns)(df)